@@ -26,7 +26,7 @@ class TestApp():
     ICON = icons.app
 
     def __init__(self):
-        self.tests = ('Alarm', 'Button', 'Checkbox', 'Crash', 'Colours', 'Fill', 'Fill-H', 'Fill-V', 'Free Mem', 'Line', 'Notifications', 'RLE', 'String', 'Touch', 'Wrap')
+        self.tests = ('Alarm', 'Button', 'Checkbox', 'Crash', 'Colours', 'Fill', 'Fill-H', 'Fill-V', 'Free Mem', 'Line', 'Notifications', 'RLE', 'Shapes', 'String', 'Touch', 'Wrap')
         self.test = self.tests[0]
         self.scroll = wasp.widgets.ScrollIndicator()
 
@@ -111,6 +111,8 @@ class TestApp():
             self._benchmark_wrap()
         elif self.test == 'Line':
             self._benchmark_line()
+        elif self.test == 'Shapes':
+            self._benchmark_shapes()
 
     def _alarm(self):
         wasp.system.wake()
@@ -199,6 +201,21 @@ class TestApp():
         del t
         draw.string('{}s'.format(elapsed / 1000000), 12, 24+192)
 
+    def _benchmark_shapes(self):
+        draw = wasp.watch.drawable
+        draw.fill(0, 0, 30, 240, 240-30)
+        self.scroll.draw()
+        t = machine.Timer(id=1, period=8000000)
+        t.start()
+        draw.ring(120, 120, 80, 90, 0, 270, 0x07c0)  # green
+        draw.ring(120, 120, 60, 70, 90, 360, 0xfb00)  # red
+        draw.circle(120, 120, 40, 0x6b3f)  # blue
+        draw.polygon(((120, 90), (145, 135), (95, 135)), 0xffe0)  # yellow
+        elapsed = t.time()
+        t.stop()
+        del t
+        draw.string('{}s'.format(elapsed / 1000000), 12, 24+192)
+
     def _benchmark_wrap(self):
         draw = wasp.watch.drawable
         draw.fill(0, 0, 30, 240, 240-30)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2020 Daniel Thompson
+
+"""Generate anti-aliased fonts for wasp-os.
+
+The generated modules have the same interface, and the same layout, as the
+fonts generated by font_to_py.py except that every pixel of each glyph has
+2 or 4 bits of coverage rather than just one. The font also provides a
+bpp() function so that draw565 can tell the difference. Each glyph row is
+padded to a whole number of bytes and pixels are packed most significant
+bits first.
+
+An advance width table (see tools/fontwidths.py) is appended to the
+generated font.
+"""
+
+import argparse
+import os.path
+import sys
+
+from PIL import Image, ImageDraw, ImageFont
+
+sys.path.append(os.path.dirname(__file__))
+import fontwidths
+
+def render(font, ch, height, bpp):
+    """Render a single glyph as (width, packed pixel data)."""
+    width = max(1, round(font.getlength(ch)))
+    im = Image.new('L', (width, height))
+    ImageDraw.Draw(im).text((0, 0), ch, font=font, fill=255)
+
+    levels = (1 << bpp) - 1
+    data = bytearray()
+    for y in range(height):
+        acc = 0
+        bits = 0
+        for x in range(width):
+            acc = (acc << bpp) | ((im.getpixel((x, y)) * levels + 127) // 255)
+            bits += bpp
+            if bits == 8:
+                data.append(acc)
+                acc = 0
+                bits = 0
+        if bits:
+            data.append(acc << (8 - bits))
+    return (width, bytes(data))
+
+def render_bytes(name, data):
+    lines = [ name + ' =\\' ]
+    for i in range(0, len(data), 16):
+        chunk = ''.join(f'\\x{b:02x}' for b in data[i:i+16])
+        lines.append(f"b'{chunk}'" + ('\\' if i + 16 < len(data) else ''))
+    return lines
+
+def convert(fname, size, bpp, default='?'):
+    font = ImageFont.truetype(fname, size)
+    (ascent, descent) = font.getmetrics()
+    height = ascent + descent
+
+    glyphs = bytearray()
+    index = bytearray()
+    max_width = 0
+    for ch in [default] + [chr(c) for c in range(32, 127)]:
+        (width, data) = render(font, ch, height, bpp)
+        max_width = max(max_width, width)
+        index += len(glyphs).to_bytes(2, 'little')
+        glyphs += width.to_bytes(2, 'little') + data
+
+    lines = [
+        '# Code generated by aafont.py.',
+        f'# Font: {os.path.basename(fname)}',
+        f'# Cmd: {" ".join(sys.argv)}',
+        "version = '0.33'",
+        '',
+        'def height():', f'    return {height}', '',
+        'def baseline():', f'    return {ascent}', '',
+        'def max_width():', f'    return {max_width}', '',
+        'def hmap():', '    return True', '',
+        'def reverse():', '    return False', '',
+        'def monospaced():', '    return False', '',
+        'def min_ch():', '    return 32', '',
+        'def max_ch():', '    return 126', '',
+        'def bpp():', f'    return {bpp}', '',
+    ]
+    lines += render_bytes('_font', glyphs) + ['']
+    lines += render_bytes('_index', index) + ['']
+    lines += [
+        '_mvfont = memoryview(_font)',
+        '_mvi = memoryview(_index)',
+        '',
+        'def get_ch(ch):',
+        '    mvi = _mvi',
+        '    mvfont = _mvfont',
+        '',
+        '    oc = ord(ch)',
+        '    ioff = 2 * (oc - 32 + 1) if oc >= 32 and oc <= 126 else 0',
+        '    doff = mvi[ioff] | (mvi[ioff+1] << 8)',
+        '    width = mvfont[doff] | (mvfont[doff+1] << 8)',
+        '',
+        f'    next_offs = doff + 2 + ((width * {bpp} - 1)//8 + 1) * {height}',
+        f'    return _mvfont[doff + 2:next_offs], {height}, width',
+        '',
+    ]
+    return '\n'.join(lines)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+            description='Anti-aliased font generator.')
+    parser.add_argument('font', help='TrueType font to convert')
+    parser.add_argument('size', type=int, help='Font size, in pixels')
+    parser.add_argument('output', help='Python module to generate')
+    parser.add_argument('--bpp', type=int, choices=(2, 4), default=2,
+                        help='Bits of coverage per pixel')
+    args = parser.parse_args()
+
+    with open(args.output, 'w') as f:
+        f.write(convert(args.font, args.size, args.bpp))
+    fontwidths.update(args.output)
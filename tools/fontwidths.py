@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2020 Daniel Thompson
+
+"""Add an advance width table to fonts generated by font_to_py.py.
+
+The table allows strings to be measured without calling get_ch() for every
+character. It holds the width of the default glyph followed by the widths
+of chr(32) to chr(126) inclusive (characters that are not included in the
+font take the width of the default glyph, exactly as get_ch() does).
+
+Running the tool again on a font that already has a width table will
+regenerate the table.
+"""
+
+import argparse
+import importlib.util
+
+MARKER = '# Advance widths, generated by tools/fontwidths.py'
+
+def load_font(fname):
+    spec = importlib.util.spec_from_file_location('font', fname)
+    font = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(font)
+    return font
+
+def widths(font):
+    # chr(31) is never included in a font so it will always select the
+    # default glyph
+    return bytes(font.get_ch(chr(ch))[2] for ch in range(31, 127))
+
+def render_py(table):
+    lines = [ MARKER, '_widths =\\' ]
+    for i in range(0, len(table), 16):
+        chunk = ''.join(f'\\x{b:02x}' for b in table[i:i+16])
+        lines.append(f"b'{chunk}'" + ('\\' if i + 16 < len(table) else ''))
+    lines += [ '', 'def widths():', '    return _widths', '' ]
+    return '\n'.join(lines)
+
+def update(fname):
+    table = widths(load_font(fname))
+
+    with open(fname) as f:
+        src = f.read()
+    if MARKER in src:
+        src = src[:src.index(MARKER)]
+    src = src.rstrip('\n') + '\n\n' + render_py(table)
+
+    with open(fname, 'w') as f:
+        f.write(src)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Font width table generator.')
+    parser.add_argument('files', nargs='*',
+                        help='font modules to be updated')
+
+    args = parser.parse_args()
+
+    for fname in args.files:
+        update(fname)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2020 Daniel Thompson
+
+"""Compare the size and decode time of 2-bit and 8-bit RLE images.
+
+The images are decoded by draw565 running on the host (using the same
+micropython shims as the simulator) into a display that discards the
+pixels. The timings are therefore only useful to compare the two formats
+with each other, not to predict the performance on a real watch.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[1:1] = [ os.path.join(root, 'wasp'),
+                  os.path.join(root, 'wasp', 'boards', 'simulator') ]
+
+import draw565
+from PIL import Image
+from rle_encode import encode_2bit, encode_8bit
+
+class NullDisplay:
+    """A display that counts, and then discards, the pixel data."""
+    def __init__(self, width=240, height=240):
+        self.width = width
+        self.height = height
+        self.linebuffer = memoryview(bytearray(2 * width))
+        self.linebuffers = (self.linebuffer, self.linebuffer)
+        self.written = 0
+
+    def set_window(self, x, y, width, height):
+        pass
+
+    def quick_start(self):
+        pass
+
+    def quick_end(self):
+        pass
+
+    def quick_write(self, buf):
+        self.written += len(buf)
+
+    write_data = quick_write
+
+def benchmark(draw, image, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        draw.blit(image, 0, 0)
+    return (time.perf_counter() - start) * 1000 / iterations
+
+parser = argparse.ArgumentParser(description='RLE decoder benchmark.')
+parser.add_argument('files', nargs='+',
+                    help='images to be encoded and decoded')
+parser.add_argument('--iterations', default=10, type=int,
+                    help='Number of times to decode each image')
+args = parser.parse_args()
+
+display = NullDisplay()
+draw = draw565.Draw565(display)
+
+print(f'{"Image":<24} {"2-bit":>7} {"ms":>8} {"8-bit":>7} {"ms":>8}')
+for fname in args.files:
+    im = Image.open(fname).convert('RGB')
+    results = []
+    for encoder in (encode_2bit, encode_8bit):
+        image = encoder(im)
+        results.append(len(image))
+        results.append(benchmark(draw, image, args.iterations))
+    print(f'{os.path.basename(fname):<24} '
+          f'{results[0]:>7} {results[1]:>8.2f} {results[2]:>7} {results[3]:>8.2f}')
@@ -221,36 +221,58 @@ def encode_2bit(im):
     return bytes(rle)
 
 def encode_8bit(im):
-    """Experimental 8-bit RLE encoder.
+    """8-bit CLUT based RLE encoder.
+
+    Every pixel is mapped to the closest colour in the wasp-os CLUT (see
+    :py:meth:`clut8_rgb888`) and the result is run length encoded.
+
+    A run of a single pixel is encoded as the CLUT index of the pixel. Longer
+    runs are encoded by repeating the CLUT index followed by the run length
+    (less two) as a variable length integer (big-endian, seven bits per byte
+    with the top bit set on all but the last byte). The encoder never emits
+    two adjacent single pixel runs of the same colour so the decoder can
+    always tell them apart.
 
     For monochrome images this is about 3x less efficient than the 1-bit
-    encoder. This encoder is not currently used anywhere in wasp-os and
-    currently there is no decoder either (so don't assume this code
-    actually works).
+    encoder but it can represent images with many colours in a single
+    layer.
     """
+    im = im.convert('RGB')
     pixels = im.load()
+    assert(im.width <= 255)
+    assert(im.height <= 255)
+
+    full_palette = ReverseCLUT(clut8_rgb888)
+
+    def lookup(x, y):
+        px = pixels[x, y]
+        return full_palette((px[0] << 16) + (px[1] << 8) + px[2])
 
     rle = []
     rl = 0
-    px = pixels[0, 0]
+    px = lookup(0, 0)
 
     def encode_pixel(px, rl):
-        px = (px[0] & 0xe0) | ((px[1] & 0xe0) >> 3) | ((px[2] & 0xc0) >> 6)
-
         rle.append(px)
-        if rl > 0:
+        if rl > 1:
             rle.append(px)
-        rl -= 2
-        if rl > (1 << 14):
-            rle.append(0x80 | ((rl >> 14) & 0x7f))
-        if rl > (1 <<  7):
-            rle.append(0x80 | ((rl >>  7) & 0x7f))
-        if rl >= 0:
-            rle.append(         rl        & 0x7f )
+            rl -= 2
+            if rl >= (1 << 14):
+                rle.append(0x80 | ((rl >> 14) & 0x7f))
+            if rl >= (1 <<  7):
+                rle.append(0x80 | ((rl >>  7) & 0x7f))
+            rle.append(rl & 0x7f)
+
+    # Issue the descriptor
+    rle.append(8)
+    rle.append(im.width)
+    rle.append(im.height)
 
     for y in range(im.height):
         for x in range(im.width):
-            newpx = pixels[x, y]
+            # Compare CLUT indices (rather than the original colours)
+            # to ensure adjacent runs never share a CLUT index
+            newpx = lookup(x, y)
             if newpx == px:
                 rl += 1
                 assert(rl < (1 << 21))
@@ -266,7 +288,38 @@ def encode_8bit(im):
     # Handle the final run
     encode_pixel(px, rl)
 
-    return (im.width, im.height, bytes(rle))
+    return bytes(rle)
+
+def encode_16bit(im):
+    """Uncompressed RGB565 encoder.
+
+    The image has the same three byte header as the 2-bit and 8-bit
+    formats (with 16 as the depth) followed by every pixel in big-endian
+    RGB565 format. This is too large to embed in a Python module but can
+    be streamed from the filesystem by :py:meth:`draw565.Draw565.blit_file`.
+    """
+    im = im.convert('RGB')
+    pixels = im.load()
+    assert(im.width <= 255)
+    assert(im.height <= 255)
+
+    data = bytearray((16, im.width, im.height))
+    for y in range(im.height):
+        for x in range(im.width):
+            (r, g, b) = pixels[x, y][0:3]
+            rgb565 = ((r & 0xf8) << 8) | ((g & 0xfc) << 3) | (b >> 3)
+            data += rgb565.to_bytes(2, 'big')
+
+    return bytes(data)
+
+def render_binary(image, fname):
+    """Write the image to a binary file suitable for blit_file()."""
+    if len(image) == 3:
+        raise ValueError('1-bit images cannot be written as binary files')
+    outname = os.path.splitext(fname)[0] + '.bin'
+    with open(outname, 'wb') as f:
+        f.write(image)
+    print(f'Wrote {len(image)} bytes to {outname}')
 
 def render_c(image, fname, indent, depth):
     extra_indent = ' ' * indent
@@ -345,47 +398,56 @@ def decode_to_ascii(image):
     # Check the image is the correct length
     assert(dp == 0)
 
-parser = argparse.ArgumentParser(description='RLE encoder tool.')
-parser.add_argument('files', nargs='*',
-                    help='files to be encoded')
-parser.add_argument('--ascii', action='store_true',
-                    help='Run the resulting image(s) through an ascii art decoder')
-parser.add_argument('--c', action='store_true',
-                    help='Render the output as C instead of python')
-parser.add_argument('--clut', default=0, type=int,
-                    help='Lookup a colour value in the CLUT')
-parser.add_argument('--indent', default=0, type=int,
-                    help='Add extra indentation in the generated code')
-parser.add_argument('--1bit', action='store_const', const=1, dest='depth',
-                    help='Generate 1-bit image')
-parser.add_argument('--2bit', action='store_const', const=2, dest='depth',
-                    help='Generate 2-bit image')
-parser.add_argument('--8bit', action='store_const', const=8, dest='depth',
-                    help='Generate 8-bit image')
-
-args = parser.parse_args()
-
-if args.clut:
-    print(f'{args.clut} maps to {clut8_rgb888(args.clut):06x} (RGB888) or {clut8_rgb565(args.clut):04x} (RGB565)')
-
-if args.depth == 8:
-    encoder = encode_8bit
-elif args.depth == 2:
-    encoder = encode_2bit
-elif args.depth == 1:
-    encoder = encode
-else:
-    encoder = encode_2bit
-    args.depth = 2
-
-for fname in args.files:
-    image = encoder(Image.open(fname))
-
-    if args.c:
-        render_c(image, fname, args.indent, args.depth)
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='RLE encoder tool.')
+    parser.add_argument('files', nargs='*',
+                        help='files to be encoded')
+    parser.add_argument('--ascii', action='store_true',
+                        help='Run the resulting image(s) through an ascii art decoder')
+    parser.add_argument('--binary', action='store_true',
+                        help='Write each image to a .bin file instead of generating code')
+    parser.add_argument('--c', action='store_true',
+                        help='Render the output as C instead of python')
+    parser.add_argument('--clut', default=0, type=int,
+                        help='Lookup a colour value in the CLUT')
+    parser.add_argument('--indent', default=0, type=int,
+                        help='Add extra indentation in the generated code')
+    parser.add_argument('--1bit', action='store_const', const=1, dest='depth',
+                        help='Generate 1-bit image')
+    parser.add_argument('--2bit', action='store_const', const=2, dest='depth',
+                        help='Generate 2-bit image')
+    parser.add_argument('--8bit', action='store_const', const=8, dest='depth',
+                        help='Generate 8-bit image')
+    parser.add_argument('--16bit', action='store_const', const=16, dest='depth',
+                        help='Generate uncompressed RGB565 image')
+
+    args = parser.parse_args()
+
+    if args.clut:
+        print(f'{args.clut} maps to {clut8_rgb888(args.clut):06x} (RGB888) or {clut8_rgb565(args.clut):04x} (RGB565)')
+
+    if args.depth == 16:
+        encoder = encode_16bit
+    elif args.depth == 8:
+        encoder = encode_8bit
+    elif args.depth == 2:
+        encoder = encode_2bit
+    elif args.depth == 1:
+        encoder = encode
     else:
-        render_py(image, fname, args.indent, args.depth)
+        encoder = encode_2bit
+        args.depth = 2
+
+    for fname in args.files:
+        image = encoder(Image.open(fname))
+
+        if args.binary:
+            render_binary(image, fname)
+        elif args.c:
+            render_c(image, fname, args.indent, args.depth)
+        else:
+            render_py(image, fname, args.indent, args.depth)
 
-    if args.ascii:
-        print()
-        decode_to_ascii(image)
+        if args.ascii:
+            print()
+            decode_to_ascii(image)
@@ -0,0 +1,21 @@
+# This file is auto generated from the wasp.toml. Manual changes will be overwritten. 
+
+software_list = (
+    ('apps.user.alarm', 'Alarm'),
+    ('apps.user.timer', 'Timer'),
+)
+
+faces_list = (
+    ('apps.user.clock','Clock'),
+    ('apps.user.week_clock','WeekClock'),
+)
+
+autoload_list = (
+    ('apps.user.week_clock.WeekClockApp', True, False, True),
+    ('apps.user.flashlight.FlashlightApp', True, False, False),
+    ('apps.user.stopwatch.StopwatchApp', True, False, False),
+    ('apps.user.heart.HeartApp', True, False, False),
+    ('apps.user.alarm.AlarmApp', False, False, False),
+    ('apps.user.timer.TimerApp', False, False, False),
+)
+
@@ -31,13 +31,12 @@ class PagerApp():
 
     def background(self):
         """De-activate the application."""
-        self._chunks = None
-        self._numpages = None
+        self._pages = None
 
     def swipe(self, event):
         """Swipe to page up/down."""
         if event[0] == wasp.EventType.UP:
-            if self._page >= self._numpages:
+            if not self._more:
                 wasp.system.navigate(wasp.EventType.BACK)
                 return
             self._page += 1
@@ -51,30 +50,44 @@ class PagerApp():
     def _redraw(self):
         """Redraw from scratch (jump to the first page)"""
         self._page = 0
-        self._chunks = wasp.watch.drawable.wrap(self._msg, 240)
-        self._numpages = (len(self._chunks) - 2) // 9
+        self._pages = [ 0, ]
         self._draw()
 
     def _draw(self):
-        """Draw a page from scratch."""
+        """Draw a page from scratch.
+
+        The message is only wrapped as far as the end of the current page.
+        The start of each page is remembered as it is discovered so that
+        paging backwards does not need to wrap the message again.
+        """
         mute = wasp.watch.display.mute
         draw = wasp.watch.drawable
+        msg = self._msg
 
         mute(True)
         draw.set_color(0xffff)
         draw.fill()
 
         page = self._page
-        i = page * 9
-        j = i + 11
-        chunks = self._chunks[i:j]
-        for i in range(len(chunks)-1):
-            sub = self._msg[chunks[i]:chunks[i+1]].rstrip()
-            draw.string(sub, 0, 24*i)
+        pages = self._pages
+        start = pages[page]
+        lines = 0
+        for end in draw.iwrap(msg, 240, start):
+            draw.string(msg[start:end].rstrip(), 0, 24*lines)
+            lines += 1
+            if lines == 9 and len(pages) == page + 1:
+                pages.append(end)
+            if lines == 10:
+                break
+            start = end
+
+        # The last line of each page is repeated at the top of the next
+        # page so if this page is full there is more to see
+        self._more = lines == 10
 
         scroll = self._scroll
         scroll.up = page > 0
-        scroll.down = page < self._numpages
+        scroll.down = self._more
         scroll.draw()
 
         mute(False)
@@ -130,10 +130,10 @@ class StepCounterApp():
         # Update the step count
         count = watch.accel.steps
         t = str(count)
-        w = fonts.width(fonts.sans36, t)
         draw.set_font(fonts.sans36)
-        draw.set_color(draw.lighten(wasp.system.theme('spot1'), wasp.system.theme('contrast')))
-        draw.string(t, 228-w, 132-18)
+        draw.set_color(wasp.system.shade(wasp.Theme.SPOT1,
+                                         wasp.system.theme(wasp.Theme.CONTRAST)))
+        draw.update_string(t, 64, 132-18, width=164, right=True)
 
     def _update_graph(self):
         draw = watch.drawable
@@ -23,6 +23,7 @@ freeze('../..', manifest_240x240.manifest + manifest_user_apps.manifest +
         'gadgetbridge.py',
         'ppg.py',
         'shell.py',
+        'trig.py',
         'wasp.py',
     ),
     opt=3
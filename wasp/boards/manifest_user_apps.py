@@ -0,0 +1,11 @@
+# This file is auto generated from the wasp.toml. Manual changes will be overwritten. 
+
+manifest = (
+    'apps/user/flashlight.py',
+    'apps/user/stopwatch.py',
+    'apps/user/heart.py',
+    'apps/user/alarm.py',
+    'apps/user/timer.py',
+    'apps/user/clock.py',
+    'apps/user/week_clock.py',
+)
\ No newline at end of file
@@ -13,14 +13,22 @@ import numpy as np
 from PIL import Image
 import wasp
 
+PTLON = 0x12
+NORON = 0x13
 DISPOFF = 0x28
 DISPON = 0x29
 CASET = 0x2a
 RASET = 0x2b
 RAMWR = 0x2c
+PTLAR = 0x30
+VSCRDEF = 0x33
+VSCSAD = 0x37
+IDMOFF = 0x38
+IDMON = 0x39
 
 WIDTH = 240
 HEIGHT = 240
+FRAME_ROWS = 320
 
 SKIN = {
     'fname' : 'res/simulator_skin.png',
@@ -39,6 +47,51 @@ class ST7789Sim(object):
         self.cmd = 0
         self.mute = False
 
+        # Vertical scrolling: top fixed area, scroll area and start address
+        self.tfa = 0
+        self.vsa = FRAME_ROWS
+        self.vsp = 0
+        self.memory = np.zeros((WIDTH, FRAME_ROWS), dtype=np.uint32)
+
+        # Low power modes: partial area (first and last row, if enabled)
+        # and idle (eight colour) mode
+        self.ptlar = (0, FRAME_ROWS-1)
+        self.partial = None
+        self.idle = False
+
+    def display_row(self, y):
+        """Find the row of the display that shows a row of frame memory."""
+        if self.tfa <= y < self.tfa + self.vsa:
+            y = self.tfa + (y - self.vsp) % self.vsa
+        return y
+
+    def memory_row(self, y):
+        """Find the row of frame memory that is shown on a row of the display."""
+        if self.tfa <= y < self.tfa + self.vsa:
+            y = self.tfa + (y - self.tfa + self.vsp - self.tfa) % self.vsa
+        return y
+
+    def shown(self, pixels, y):
+        """Apply the partial and idle modes to pixels on row y."""
+        if self.partial and not self.partial[0] <= y <= self.partial[1]:
+            return 0 * pixels
+        if self.idle:
+            pixels = (((pixels >> 23) & 1) * 0xff0000 |
+                      ((pixels >> 15) & 1) * 0x00ff00 |
+                      ((pixels >> 7) & 1) * 0x0000ff)
+        return pixels
+
+    def refresh(self):
+        """Redraw the whole display from the frame memory."""
+        pixelview = sdl2.ext.pixels2d(windowsurface)
+        (ax, ay) = SKIN['adjust']
+        for y in range(HEIGHT):
+            pixelview[ax:ax+WIDTH, ay+y] = \
+                    self.shown(self.memory[:, self.memory_row(y)], y)
+        del pixelview
+        if not self.mute:
+            window.refresh()
+
     def write(self, data):
         # Converting data to a memoryview ensures we act more like spi.write()
         # when running in a real device (e.g. data must be  bytes-like object
@@ -55,8 +108,17 @@ class ST7789Sim(object):
             elif cmd == DISPON:
                 self.mute = False
                 window.refresh()
+            elif cmd in (PTLON, NORON):
+                self.partial = self.ptlar if cmd == PTLON else None
+                self.refresh()
+            elif cmd in (IDMON, IDMOFF):
+                self.idle = cmd == IDMON
+                self.refresh()
             else:
                 self.cmd = data[0]
+                if cmd == RAMWR:
+                    self.x = self.colclip[0]
+                    self.y = self.rowclip[0]
 
         elif self.cmd == CASET:
             self.colclip[0] = (data[0] << 8) + data[1]
@@ -72,6 +134,19 @@ class ST7789Sim(object):
             assert(self.rowclip[1] >= 0 and self.rowclip[1] <= 240)
             self.y = self.rowclip[0]
 
+        elif self.cmd == PTLAR:
+            self.ptlar = ((data[0] << 8) + data[1], (data[2] << 8) + data[3])
+
+        elif self.cmd == VSCRDEF:
+            self.tfa = (data[0] << 8) + data[1]
+            self.vsa = (data[2] << 8) + data[3]
+            bfa = (data[4] << 8) + data[5]
+            assert(self.tfa + self.vsa + bfa == FRAME_ROWS)
+
+        elif self.cmd == VSCSAD:
+            self.vsp = (data[0] << 8) + data[1]
+            self.refresh()
+
         elif self.cmd == RAMWR:
             #pixelview = sdl2.ext.PixelView(windowsurface)
             pixelview = sdl2.ext.pixels2d(windowsurface)
@@ -92,9 +167,13 @@ class ST7789Sim(object):
                          ((rgb & 0x07e0) << 5) +
                          ((rgb & 0x001f) << 3))
             
-                pv_x = self.x + SKIN['adjust'][0]
-                pv_y = self.y + SKIN['adjust'][1]
-                pixelview[pv_x][pv_y] = pixel
+                if self.x < WIDTH:
+                    self.memory[self.x][self.y] = pixel
+                y = self.display_row(self.y)
+                if y < HEIGHT:
+                    pv_x = self.x + SKIN['adjust'][0]
+                    pv_y = y + SKIN['adjust'][1]
+                    pixelview[pv_x][pv_y] = self.shown(pixel, y)
 
                 self.x += 1
                 if self.x > self.colclip[1]:
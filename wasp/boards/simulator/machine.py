@@ -67,21 +67,63 @@ class PWM(Tracer):
     FREQ_16MHZ = 'FREQ_16MHZ'
 
 class SPI(object):
+    """Simulated SPI controller.
+
+    Data is delivered to the simulated device immediately but the
+    controller also models how long each transfer would occupy the bus.
+    write() blocks until the transfer is complete whilst write_async()
+    only blocks if an earlier transfer is still in progress. Nothing
+    actually sleeps. Instead the time the bus is busy, and the time the
+    CPU would have spent waiting for it, are accumulated in bus_time and
+    stall_time (in seconds). CPU time is measured on the host so the
+    results are only indicative, but they are good enough to show how
+    much drawing overlaps with the transfers.
+    """
     def __init__(self, id):
         self._id = id
         if id == 0:
             self.sim = display.spi_st7789_sim
         else:
             self.sim = None
+        self.baudrate = 1000000
+        self.reset_timing()
 
     def init(self, baudrate=1000000,  polarity=0, phase=0, bits=8, sck=None, mosi=None, miso=None):
-        pass
+        self.baudrate = baudrate
+
+    def reset_timing(self):
+        self.bus_time = 0
+        self.stall_time = 0
+        self._skew = 0
+        self._done = 0
+
+    def _now(self):
+        return time.perf_counter() + self._skew
 
     def write(self, buf):
+        self.write_async(buf)
+        self.wait()
+
+    def write_async(self, buf):
+        self.wait()
+        t = 8 * len(buf) / self.baudrate
+        self._done = self._now() + t
+        self.bus_time += t
+
+        # The time taken to simulate the device should not look like
+        # drawing time
+        start = time.perf_counter()
         if self.sim:
             self.sim.write(buf)
         else:
             print("Sending data: " + str(buf))
+        self._skew -= time.perf_counter() - start
+
+    def wait(self):
+        delay = self._done - self._now()
+        if delay > 0:
+            self._skew += delay
+            self.stall_time += delay
 
 class I2C():
     def __init__(self, id):
@@ -1,6 +1,79 @@
+import array
 import draw565
 import fonts
+import math
 import pytest
+import trig
+import wasp  # Brings up the simulated watch (and time.sleep_ms)
+
+from drivers.st7789 import ST7789_SPI
+
+class Pin:
+    OUT = 'OUT'
+
+    def __init__(self):
+        self._value = 1
+
+    def init(self, d, value):
+        self._value = value
+
+    def value(self, v=None):
+        if v is None:
+            return self._value
+        self._value = v
+
+class Panel:
+    """Minimal ST7789 model that decodes SPI traffic into a framebuffer."""
+    def __init__(self, width=240, height=240):
+        self.width = width
+        self.height = height
+        self.fb = bytearray(2 * width * height)
+        self.cs = Pin()
+        self.dc = Pin()
+        self.cmd = 0
+        self.cmds = []
+        self.cols = [0, width-1]
+        self.rows = [0, height-1]
+        self.x = 0
+        self.y = 0
+        self.written = 0
+        self.scroll = [0, height, 0]    # top, height and start address
+
+    def write(self, buf):
+        buf = bytes(buf)
+        if not self.dc.value():
+            self.cmd = buf[0]
+            self.cmds.append(self.cmd)
+            if self.cmd == 0x2c:
+                self.x = self.cols[0]
+                self.y = self.rows[0]
+        elif self.cmd == 0x2a:
+            self.cols = [(buf[0] << 8) + buf[1], (buf[2] << 8) + buf[3]]
+        elif self.cmd == 0x2b:
+            self.rows = [(buf[0] << 8) + buf[1], (buf[2] << 8) + buf[3]]
+        elif self.cmd == 0x33:
+            self.scroll[0:2] = [(buf[0] << 8) + buf[1], (buf[2] << 8) + buf[3]]
+        elif self.cmd == 0x37:
+            self.scroll[2] = (buf[0] << 8) + buf[1]
+        elif self.cmd == 0x2c:
+            self.written += len(buf) // 2
+            fb = self.fb
+            for i in range(0, len(buf), 2):
+                offset = 2 * (self.y * self.width + self.x)
+                fb[offset:offset+2] = buf[i:i+2]
+                self.x += 1
+                if self.x > self.cols[1]:
+                    self.x = self.cols[0]
+                    self.y += 1
+                    if self.y > self.rows[1]:
+                        self.y = self.rows[0]
+
+    def pixel(self, x, y):
+        (top, height, start) = self.scroll
+        if top <= y < top + height:
+            y = top + (y - top + start - top) % height
+        offset = 2 * (y * self.width + x)
+        return (self.fb[offset] << 8) + self.fb[offset+1]
 
 @pytest.fixture
 def draw():
@@ -13,6 +86,20 @@ def draw():
 
     return d
 
+@pytest.fixture
+def panel():
+    """Provide a drawing surface backed by a simulated panel.
+
+    The drawing surface is available as panel.draw and the panel model
+    can be used to inspect the resulting pixels and command stream.
+    """
+    p = Panel()
+    p.display = ST7789_SPI(p.width, p.height, p, p.cs, p.dc)
+    p.draw = draw565.Draw565(p.display)
+    p.cmds.clear()
+
+    return p
+
 def test_lighten(draw):
     assert draw.lighten(0b00000_000000_00000         ) == 0b00001_000010_00001
     assert draw.lighten(0b00000_000000_00000, 0b00001) == 0b00001_000010_00001
@@ -70,3 +157,959 @@ def test_font_width(draw):
 ))
 def test_wrap(draw, input, expected):
     assert draw.wrap(input, 240) == expected
+
+def test_glyph_cache(panel):
+    draw = panel.draw
+    draw.set_color(0xf800, 0x001f)
+    draw.string('10:10', 0, 0)
+    expected = bytes(panel.fb)
+
+    panel.fb[:] = bytes(len(panel.fb))
+    draw.set_glyph_cache(4096)
+    cache = draw.glyph_cache
+    draw.string('10:10', 0, 0)
+    assert (cache.hits, cache.misses) == (2, 3)
+    assert bytes(panel.fb) == expected
+
+    # Filling the cache must evict the least recently used glyphs
+    draw.string('ABCDEFGH', 0, 30)
+    assert cache.used <= cache.budget
+    draw.string('H', 0, 60)
+    assert cache.hits == 3
+
+    draw.drop_caches()
+    assert cache.used == 0
+    assert cache.hits == 0
+
+@pytest.mark.parametrize("right", (False, True))
+def test_string_strip(panel, right):
+    draw = panel.draw
+    draw.set_color(0xffff, 0x4208)
+    draw.strip_text = False
+    draw.string('12:34', 8, 8, width=200, right=right)
+    expected = bytes(panel.fb)
+    per_glyph = panel.cmds.count(0x2c)
+
+    panel.fb[:] = bytes(len(panel.fb))
+    panel.cmds.clear()
+    draw.strip_text = True
+    draw.string('12:34', 8, 8, width=200, right=right)
+    assert bytes(panel.fb) == expected
+    assert panel.cmds.count(0x2c) == 1 < per_glyph
+
+def test_update_string(panel):
+    draw = panel.draw
+    draw.set_font(fonts.sans36)
+    draw.string('12:59', 0, 0, width=180, right=True)
+    draw.string('13:00', 0, 0, width=180, right=True)
+    expected = bytes(panel.fb)
+
+    panel.fb[:] = bytes(len(panel.fb))
+    draw.fill()
+    draw.update_string('12:59', 0, 0, width=180, right=True)
+    panel.cmds.clear()
+    draw.update_string('13:00', 0, 0, width=180, right=True)
+    assert bytes(panel.fb) == expected
+    # Two runs have changed ('2' and '59')
+    assert panel.cmds.count(0x2c) == 2
+
+    # Nothing has changed so nothing should be drawn
+    panel.cmds.clear()
+    draw.update_string('13:00', 0, 0, width=180, right=True)
+    assert not panel.cmds
+
+    # A change of width forces a full redraw
+    draw.update_string('13:1', 0, 0, width=180, right=True)
+    draw.update_string('13:11', 0, 0, width=180, right=True)
+    panel.cmds.clear()
+    draw.update_string('13:1.', 0, 0, width=180, right=True)
+    assert panel.cmds.count(0x2c) == 1
+
+@pytest.mark.parametrize("font",
+        (fonts.sans18, fonts.sans24, fonts.sans28, fonts.sans36))
+def test_font_widths(font):
+    table = fonts.widths(font)
+    assert len(table) == 96
+    for ch in [chr(c) for c in range(32, 127)] + ['£', '\n']:
+        assert fonts.width(font, ch) == font.get_ch(ch)[2] + 1
+
+class WideFont:
+    """A 1-bit font with a wide glyph beyond chr(126)."""
+    _narrow = memoryview(bytes((0xf0, 0xf0)))
+    _wide = memoryview(bytes((0xff, 0xff, 0xf8) * 2))
+
+    def height():
+        return 2
+
+    def max_ch():
+        return 176
+
+    def get_ch(ch):
+        if ch == '°':
+            return (WideFont._wide, 2, 21)
+        return (WideFont._narrow, 2, 4)
+
+def test_font_wide_glyph(panel):
+    table = fonts.widths(WideFont)
+    assert table[0] == 4
+    assert fonts.width(WideFont, '°') == 22
+    assert fonts.width(WideFont, '1°\n') == 5 + 22 + 5
+
+    draw = panel.draw
+    draw.set_font(WideFont)
+    assert draw.bounding_box('°') == (22, 2)
+    draw.set_color(0xffff, 0x001f)
+    draw.string('1°', 0, 0, width=40)
+    row = [panel.pixel(x, 0) for x in range(40)]
+    assert row[6:10] == [0xffff] * 4
+    assert row[11:32] == [0xffff] * 21
+    assert row[32] == 0x001f
+    assert list(draw.iwrap('°' * 20, 240)) == [10, 20]
+
+def test_iwrap(draw):
+    s = 'This\nis a very long string that will need to be wrappedinmultipledifferentways!' * 4
+    chunks = draw.wrap(s, 240)
+    assert list(draw.iwrap(s, 240)) == chunks[1:]
+
+    # Resuming from any line boundary must give the same result
+    for i in range(len(chunks)-1):
+        assert list(draw.iwrap(s, 240, chunks[i])) == chunks[i+1:]
+
+def test_image_cache(panel):
+    import icons
+    images = [ getattr(icons, n) for n in dir(icons) if not n.startswith('_') ]
+    images = [ i for i in images if isinstance(i, bytes) and i[0] == 2 ]
+    assert images
+
+    draw = panel.draw
+    for image in images:
+        panel.fb[:] = bytes(len(panel.fb))
+        draw.blit(image, 0, 0, 0xf800, 0x07e0, 0x001f)
+        expected = bytes(panel.fb)
+
+        draw.set_image_cache(32768)
+        for i in range(2):
+            panel.fb[:] = bytes(len(panel.fb))
+            draw.blit(image, 0, 0, 0xf800, 0x07e0, 0x001f)
+            assert bytes(panel.fb) == expected
+        assert (draw.image_cache.hits, draw.image_cache.misses) == (1, 1)
+        assert 0 < draw.image_cache.used < len(image) * 4
+        draw.set_image_cache(0)
+
+@pytest.mark.parametrize("fname", ('res/app_icon.png', 'res/pine64.png'))
+def test_rle8bit(panel, fname):
+    import importlib.util
+    from PIL import Image
+
+    spec = importlib.util.spec_from_file_location('rle_encode', 'tools/rle_encode.py')
+    rle_encode = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(rle_encode)
+
+    im = Image.open(fname).convert('RGB')
+    image = rle_encode.encode_8bit(im)
+    assert image[0] == 8
+
+    panel.draw.blit(image, 0, 0)
+
+    clut = rle_encode.ReverseCLUT(rle_encode.clut8_rgb888)
+    pixels = im.load()
+    for y in range(im.height):
+        for x in range(im.width):
+            (r, g, b) = pixels[x, y]
+            expected = rle_encode.clut8_rgb565(clut((r << 16) + (g << 8) + b))
+            assert panel.pixel(x, y) == expected
+
+@pytest.mark.parametrize("x1,y1", ((170, 140), (140, 170), (70, 100), (100, 70),
+                                   (170, 100), (100, 170), (70, 140), (140, 70)))
+def test_line(panel, x1, y1):
+    draw = panel.draw
+    draw.line(120, 120, x1, y1, color=0xffff)
+    lit = set((x, y) for x in range(240) for y in range(240) if panel.pixel(x, y))
+
+    assert (120, 120) in lit
+    assert (x1, y1) in lit
+
+    # A thin line must have exactly one pixel for each step along its
+    # major axis and each run must be drawn in a single window
+    major = max(abs(x1 - 120), abs(y1 - 120))
+    assert len(lit) == major + 1
+    minor = min(abs(x1 - 120), abs(y1 - 120))
+    assert panel.cmds.count(0x2c) <= minor + 1
+
+@pytest.mark.parametrize("width", (2, 3, 4, 5, 7))
+def test_thick_line(panel, width):
+    draw = panel.draw
+    draw.line(120, 120, 170, 170, width, 0xffff)
+    lit = set((x, y) for x in range(240) for y in range(240) if panel.pixel(x, y))
+
+    # The area should be close to the area of a width x (length + width)
+    # rectangle and we should need no more than one window per row
+    length = 50 * 2 ** 0.5
+    assert abs(len(lit) - width * (length + width)) < 2 * (length + width)
+    assert (145, 145) in lit
+    assert panel.cmds.count(0x2c) <= 50 + 2 * width
+
+@pytest.mark.parametrize("x0,y0,x1,y1,width", ((1, 1, 100, 50, 3),
+                                              (1, 5, 100, 50, 3),
+                                              (2, 120, 100, 2, 5),
+                                              (238, 120, 140, 238, 5)))
+def test_thick_line_edge(panel, x0, y0, x1, y1, width):
+    draw = panel.draw
+    draw.line(x0, y0, x1, y1, width, 0xffff)
+    assert panel.pixel(x0, y0) == 0xffff
+    assert panel.pixel(x1, y1) == 0xffff
+    assert panel.pixel((x0 + x1) // 2, (y0 + y1) // 2) == 0xffff
+
+def test_circle(panel):
+    draw = panel.draw
+    draw.circle(120, 100, 30, 0xffff)
+    lit = set((x, y) for x in range(240) for y in range(240) if panel.pixel(x, y))
+
+    expected = set((x, y) for x in range(240) for y in range(240)
+                   if (x-120) ** 2 + (y-100) ** 2 <= 30 * 30 + 30)
+    assert lit == expected
+    assert panel.cmds.count(0x2c) == 61
+
+@pytest.mark.parametrize("start,end", ((0, 360), (0, 90), (300, 90), (45, 315)))
+def test_ring(panel, start, end):
+    draw = panel.draw
+    draw.ring(120, 120, 80, 100, start, end, 0xffff)
+    lit = set((x, y) for x in range(240) for y in range(240) if panel.pixel(x, y))
+
+    def angle(x, y):
+        return math.degrees(math.atan2(x - 120, 120 - y)) % 360
+
+    def near(a, b):
+        return min((a - b) % 360, (b - a) % 360) < 1
+
+    for x in range(240):
+        for y in range(240):
+            d = (x - 120) ** 2 + (y - 120) ** 2
+            theta = angle(x, y)
+            inside = (100*100 + 100 >= d > 80*80 - 80 and
+                      (end - start >= 360 or
+                       (theta - start) % 360 <= (end - start) % 360))
+
+            # Pixels that lie on the edges of the arc could go either way
+            if inside != ((x, y) in lit):
+                assert near(theta, start) or near(theta, end)
+
+    # No more than two windows for each row
+    assert panel.cmds.count(0x2c) <= 2 * 201
+
+def test_polygon(panel):
+    draw = panel.draw
+    draw.polygon(((20, 30), (60, 30), (60, 50), (20, 50)), 0xffff)
+    lit = set((x, y) for x in range(240) for y in range(240) if panel.pixel(x, y))
+    assert lit == set((x, y) for x in range(20, 60) for y in range(30, 50))
+    assert panel.cmds.count(0x2c) == 20
+
+    panel.fb[:] = bytes(len(panel.fb))
+    draw.polygon(((120, 40), (140, 120), (100, 120)), 0xffff)
+    lit = set((x, y) for x in range(240) for y in range(240) if panel.pixel(x, y))
+    assert (120, 45) in lit and (120, 119) in lit and (101, 119) in lit
+    assert (120, 38) not in lit and (100, 60) not in lit
+    assert abs(len(lit) - 40 * 80 // 2) < 80
+
+def test_trig():
+    for theta in range(-360, 721):
+        r = math.radians(theta)
+        assert abs(trig.isin(theta) - trig.ONE * math.sin(r)) <= 0.5
+        assert abs(trig.icos(theta) - trig.ONE * math.cos(r)) <= 0.5
+
+    for theta in range(0, 360, 6):
+        r = math.radians(theta)
+        assert trig.polar_x(120, theta, 100) == round(120 + 100 * math.sin(r))
+        assert trig.polar_y(120, theta, 100) == round(120 - 100 * math.cos(r))
+
+def test_canvas(panel):
+    import icons
+
+    def compose(draw, x, y):
+        draw.fill(0x001f, x, y, 100, 60)
+        draw.blit(icons.checkbox, x + 60, y + 10, 0xffff, 0xf800, 0x07e0)
+        draw.set_color(0xffff, 0x001f)
+        draw.string('OK', x, y + 20, width=60)
+        draw.line(x + 5, y + 55, x + 95, y + 45, 3, 0xffe0)
+
+    compose(panel.draw, 70, 90)
+    expected = bytes(panel.fb)
+
+    panel.fb[:] = bytes(len(panel.fb))
+    canvas = draw565.Canvas(panel.display, 100, 60)
+    compose(canvas, 0, 0)
+    panel.cmds.clear()
+    canvas.flush(70, 90)
+    assert bytes(panel.fb) == expected
+    assert panel.cmds == [0x2a, 0x2b, 0x2c]
+
+def test_canvas_clip(panel):
+    buf = bytearray(2 * 40 * 30)
+    canvas = draw565.Canvas(panel.display, 40, 30, buf)
+    canvas.fill(0xf800)
+    canvas.fill(0x07e0, -10, -10, 20, 20)
+    canvas.fill(0x001f, 30, 20, 20, 20)
+    canvas.blit((20, 20, [0, 400]), 30, -10)
+    canvas.flush(100, 100)
+
+    assert panel.pixel(100, 100) == 0x07e0
+    assert panel.pixel(110, 110) == 0xf800
+    assert panel.pixel(139, 129) == 0x001f
+    assert panel.pixel(139, 100) == 0xffff
+    assert panel.pixel(140, 100) == 0
+    assert panel.pixel(99, 99) == 0
+
+    with pytest.raises(ValueError):
+        draw565.Canvas(panel.display, 40, 31, buf)
+
+def test_canvas_flush_draw(panel):
+    draw = panel.draw
+    canvas = draw565.Canvas(panel.display, 20, 20)
+    canvas.fill(0x07e0)
+
+    # Batched operations are drawn before the canvas
+    draw.begin()
+    draw.fill(0xf800)
+    canvas.flush(40, 40, draw)
+    draw.commit()
+    assert panel.pixel(45, 45) == 0x07e0
+    assert panel.pixel(39, 45) == 0xf800
+
+    # The clip rectangle is respected
+    draw.push_clip(0, 0, 50, 240)
+    canvas.fill(0x001f)
+    canvas.flush(40, 100, draw)
+    canvas.flush(100, 100, draw)
+    draw.pop_clip()
+    assert panel.pixel(45, 105) == 0x001f
+    assert panel.pixel(55, 105) == 0xf800
+    assert panel.pixel(105, 105) == 0xf800
+
+def test_batch(panel):
+    import icons
+
+    def compose(draw):
+        draw.fill(0xf800, 10, 50, 100, 60)      # overdrawn
+        draw.fill(0x001f, 0, 0, 120, 20)
+        draw.fill(0x001f, 0, 20, 120, 20)       # merged (below)
+        draw.fill(0x001f, 120, 0, 60, 40)       # merged (to the right)
+        draw.fill(0, 0, 40, 240, 80)
+        draw.blit(icons.checkbox, 10, 10, 0xffff, 0xf800, 0x07e0)
+        draw.fill(0x07e0, 50, 10, 20, 20)
+        draw.set_color(0xffff, 0x001f)
+        draw.string('12', 0, 50, width=100)
+        draw.fill(0x07e0, 70, 10, 20, 20)       # merged (past the string)
+        draw.set_color(0xf800)
+        draw.fill(None, 0, 130, 20, 20)
+        draw.line(0, 125, 100, 140)             # flushes the display list
+        draw.fill(None, 0, 150, 20, 20)         # cannot merge past line
+
+    compose(panel.draw)
+    expected = bytes(panel.fb)
+
+    panel.fb[:] = bytes(len(panel.fb))
+    panel.cmds.clear()
+    draw = panel.draw
+    draw.reset()
+    draw.begin()
+    compose(draw)
+    assert draw.commit() == 4
+    assert bytes(panel.fb) == expected
+    assert draw.commit() == 0
+
+def test_batch_nested(panel):
+    draw = panel.draw
+    draw.begin()
+    draw.begin()
+    draw.fill(0xffff, 0, 0, 10, 10)
+    assert draw.commit() == 0
+    draw.fill(0xffff, 10, 0, 10, 10)
+    assert panel.pixel(0, 0) == 0
+    assert draw.commit() == 1
+    assert panel.pixel(0, 0) == 0xffff
+    assert panel.cmds.count(0x2c) == 1
+
+def test_batch_reset(panel):
+    draw = panel.draw
+    with pytest.raises(RuntimeError):
+        draw.begin()
+        draw.fill(0xf800)
+        raise RuntimeError()
+
+    draw.reset()
+    panel.cmds.clear()
+    draw.fill(0x07e0, 0, 0, 10, 10)
+    assert panel.cmds.count(0x2c) == 1
+    assert panel.pixel(0, 0) == 0x07e0
+    assert panel.pixel(20, 20) == 0
+
+def test_clip_reset(panel):
+    draw = panel.draw
+    draw.push_clip(0, 0, 10, 10)
+    draw.push_clip(5, 5, 10, 10)
+    draw.reset()
+    assert draw._display is panel.display
+    draw.fill(0x07e0, 0, 0, 20, 20)
+    assert panel.pixel(19, 19) == 0x07e0
+
+def test_clip(panel):
+    import icons
+
+    def scene(draw):
+        draw.fill(0x001f, 20, 20, 200, 200)
+        draw.blit(icons.app, 60, 60, 0xffff)
+        draw.blit(icons.checkbox, 150, 100, 0xffff, 0xf800, 0x07e0)
+        draw.blit((10, 10, [0, 50, 50]), 100, 150)
+        draw.set_color(0xffff, 0x001f)
+        draw.string('Clipped', 30, 120, width=180)
+        draw.strip_text = False
+        draw.string('Glyphs', 30, 150)
+        draw.strip_text = True
+        draw.line(10, 10, 230, 200, 1, 0xf800)
+        draw.line(230, 10, 10, 200, 5, 0x07e0)
+        draw.circle(120, 120, 30, 0xffe0)
+
+    scene(panel.draw)
+    expected = bytes(panel.fb)
+
+    panel.fb[:] = bytes(len(panel.fb))
+    panel.written = 0
+    draw = panel.draw
+    draw.push_clip(50, 50, 150, 150)
+    draw.push_clip(90, 100, 200, 60)
+    scene(draw)
+    draw.pop_clip()
+    draw.pop_clip()
+
+    for y in range(240):
+        for x in range(240):
+            if 90 <= x < 200 and 100 <= y < 160:
+                assert panel.pixel(x, y) == (expected[2*(y*240+x)] << 8) + \
+                                            expected[2*(y*240+x)+1]
+            else:
+                assert panel.pixel(x, y) == 0
+
+    # Only the pixels within the clip rectangle should be sent
+    assert panel.written <= 110 * 60 * 3
+
+    # Clip is removed
+    draw.fill(0xffff, 0, 0, 10, 10)
+    assert panel.pixel(0, 0) == 0xffff
+
+class AAFont:
+    """A tiny 2-bit anti-aliased font (every character is the same)."""
+    _data = memoryview(bytes((0x1b, 0xe4)))
+
+    def height():
+        return 2
+
+    def bpp():
+        return 2
+
+    def get_ch(ch):
+        return (AAFont._data, 2, 4)
+
+@pytest.mark.parametrize("mode", ('strip', 'glyph', 'cache'))
+def test_aa_font(panel, mode):
+    draw = panel.draw
+    draw.set_font(AAFont)
+    draw.set_color(0xffff, 0x001f)
+    if mode == 'glyph':
+        draw.strip_text = False
+    elif mode == 'cache':
+        draw.set_glyph_cache(4096)
+        draw.string('AA', 0, 0)
+    draw.string('AA', 0, 0)
+
+    row0 = [panel.pixel(x, 0) for x in range(10)]
+    row1 = [panel.pixel(x, 1) for x in range(10)]
+    assert row0 == [0x001f, 0x52bf, 0xad5f, 0xffff, 0x001f] * 2
+    assert row1 == [0xffff, 0xad5f, 0x52bf, 0x001f, 0x001f] * 2
+
+    # The blend table is calculated only once for each colour pair
+    assert len(draw._blends) == 1
+
+def test_shades():
+    draw = wasp.watch.drawable
+    system = wasp.system
+    saved = system._theme
+
+    for theme in (saved, bytes(range(20)) + b'\x00\x03'):
+        assert system.set_theme(theme)
+        for name in ('ui', 'mid', 'spot1', 'bright'):
+            color = system.theme(name)
+            for step in range(1, 40):
+                assert system.shade(name, step) == draw.lighten(color, step)
+                assert system.shade(name, -step) == draw.darken(color, step)
+            assert system.shade(name, 0) == color
+
+    assert system.set_theme(saved)
+    assert system.theme(wasp.Theme.UI) == system.theme('ui')
+    assert system.shade(wasp.Theme.UI, -1) == draw.darken(system.theme('ui'))
+
+    for bad in ('no-such-colour', 11):
+        with pytest.raises(IndexError):
+            system.theme(bad)
+        with pytest.raises(IndexError):
+            system.shade(bad, 1)
+
+def _rle_encode():
+    import importlib.util
+    spec = importlib.util.spec_from_file_location('rle_encode', 'tools/rle_encode.py')
+    rle_encode = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(rle_encode)
+    return rle_encode
+
+def _image(depth):
+    import icons
+    if depth == 1:
+        return (20, 10, [5, 10, 30, 7, 100, 48])
+    if depth == 2:
+        return icons.checkbox
+
+    from PIL import Image
+    im = Image.open('res/app_icon.png').convert('RGB').crop((24, 8, 72, 56))
+    return _rle_encode().encode_8bit(im)
+
+@pytest.mark.parametrize("depth", (1, 2, 8))
+@pytest.mark.parametrize("scale", (2, 3))
+def test_scaled_blit(panel, depth, scale):
+    image = _image(depth)
+    (w, h) = image[0:2] if depth == 1 else image[1:3]
+
+    draw = panel.draw
+    draw.blit(image, 0, 0, 0xffe0)
+    expected = [[panel.pixel(x, y) for x in range(w)] for y in range(h)]
+
+    panel.fb[:] = bytes(len(panel.fb))
+    panel.cmds.clear()
+    draw.blit(image, 4, 2, 0xffe0, scale=scale)
+    assert panel.cmds.count(0x2c) == 1
+    for y in range(h * scale):
+        for x in range(w * scale):
+            assert panel.pixel(x + 4, y + 2) == expected[y // scale][x // scale]
+    assert panel.pixel(4 + w * scale, 2) == 0
+    assert panel.pixel(4, 2 + h * scale) == 0
+
+def test_scaled_blit_too_wide(panel):
+    import icons
+    with pytest.raises(ValueError):
+        panel.draw.blit(icons.app, 0, 0, scale=4)
+
+@pytest.mark.parametrize("depth", (2, 8))
+def test_blit_file(panel, tmp_path, depth):
+    import icons
+    from PIL import Image
+    if depth == 2:
+        image = icons.app
+    else:
+        image = _rle_encode().encode_8bit(Image.open('res/app_icon.png'))
+    assert len(image) > draw565._CHUNK_SIZE
+    (w, h) = image[1:3]
+    fname = str(tmp_path / 'image.bin')
+    with open(fname, 'wb') as f:
+        f.write(image)
+
+    draw = panel.draw
+    draw.blit(image, 8, 8, 0xffe0)
+    expected = bytes(panel.fb)
+
+    panel.fb[:] = bytes(len(panel.fb))
+    panel.cmds.clear()
+    draw.blit_file(fname, 8, 8, 0xffe0)
+    assert panel.cmds.count(0x2c) == 1
+    assert panel.fb == expected
+
+def test_blit_file_raw(panel, tmp_path):
+    from PIL import Image
+    im = Image.open('res/app_icon.png').convert('RGB')
+    fname = str(tmp_path / 'image.bin')
+    with open(fname, 'wb') as f:
+        f.write(_rle_encode().encode_16bit(im))
+
+    panel.draw.blit_file(fname, 10, 20)
+    for (x, y) in ((0, 0), (48, 32), (im.width-1, im.height-1)):
+        (r, g, b) = im.getpixel((x, y))
+        assert panel.pixel(x + 10, y + 20) == \
+                ((r & 0xf8) << 8) | ((g & 0xfc) << 3) | (b >> 3)
+    assert panel.pixel(10 + im.width, 20) == 0
+    assert panel.pixel(10, 20 + im.height) == 0
+
+def test_blit_file_bad_format(panel, tmp_path):
+    fname = str(tmp_path / 'image.bin')
+    with open(fname, 'wb') as f:
+        f.write(b'\x01\x02')
+    with pytest.raises(ValueError):
+        panel.draw.blit_file(fname, 0, 0)
+
+def test_gradient(panel):
+    draw = panel.draw
+    draw.gradient(0xf800, 0x001f, 10, 20, 50, 32)
+    assert panel.cmds.count(0x2c) == 1
+    assert panel.pixel(10, 20) == 0xf800
+    assert panel.pixel(59, 51) == 0x001f
+    assert panel.pixel(60, 51) == 0
+    assert panel.pixel(10, 52) == 0
+    for y in range(20, 52):
+        assert len(set(panel.pixel(x, y) for x in range(10, 60))) == 1
+    red = [panel.pixel(10, y) >> 11 for y in range(20, 52)]
+    assert red == sorted(red, reverse=True)
+
+    draw.gradient(0x0000, 0xffff, 0, 100, 240, 10, horizontal=True)
+    assert panel.pixel(0, 100) == 0x0000
+    assert panel.pixel(239, 109) == 0xffff
+    assert panel.pixel(120, 100) == panel.pixel(120, 109)
+    green = [(panel.pixel(x, 105) >> 5) & 0x3f for x in range(240)]
+    assert green == sorted(green)
+
+    with pytest.raises(ValueError):
+        draw.gradient(0, 0xffff, w=241)
+
+def test_pattern(panel):
+    import array
+    draw = panel.draw
+    tile = array.array('H', (0xf800, 0x07e0, 0x001f,
+                             0xffff, 0x0000, 0x1234))
+    draw.pattern(tile, 3, 5, 7, 31, 9)
+    assert panel.cmds.count(0x2c) == 1
+    for y in range(9):
+        for x in range(31):
+            assert panel.pixel(x + 5, y + 7) == tile[3 * (y % 2) + (x % 3)]
+    assert panel.pixel(36, 7) == 0
+    assert panel.pixel(5, 16) == 0
+
+    # A single row tile is only expanded once
+    panel.fb[:] = bytes(len(panel.fb))
+    draw.pattern(array.array('H', (0xffff, 0)), 2, 0, 0, 240, 4)
+    for y in range(4):
+        assert [panel.pixel(x, y) for x in range(4)] == [0xffff, 0, 0xffff, 0]
+
+def test_gradient_batch_clip(panel):
+    draw = panel.draw
+    draw.begin()
+    draw.fill(0x1234)
+    draw.gradient(0xf800, 0x001f)
+    assert draw.commit() == 1
+    assert panel.pixel(0, 0) == 0xf800
+    assert panel.pixel(239, 239) == 0x001f
+
+    panel.fb[:] = bytes(len(panel.fb))
+    draw.push_clip(0, 0, 120, 120)
+    draw.gradient(0xffff, 0xffff, horizontal=True)
+    draw.pop_clip()
+    assert panel.pixel(119, 119) == 0xffff
+    assert panel.pixel(120, 119) == 0
+    assert panel.pixel(119, 120) == 0
+
+def test_instrument(panel):
+    import icons
+    draw = panel.draw
+    stats = draw565.Stats(timing=True)
+    draw.instrument(stats)
+    panel.written = 0
+
+    draw.fill(0x1234, 0, 0, 10, 10)
+    draw.fill(0, 10, 10, 20, 20)
+    draw.blit(icons.checkbox, 40, 40)
+    assert stats.calls == { 'fill': 2, 'blit': 1 }
+    assert set(stats.us.keys()) == { 'fill', 'blit' }
+    assert stats.windows == 3
+    assert stats.cmds == 9
+
+    # Each window is three single byte commands and two 4 byte arguments
+    assert stats.bytes == 2 * panel.written + 3 * 11
+
+    stats.reset()
+    assert (stats.windows, stats.cmds, stats.bytes, stats.calls) == \
+            (0, 0, 0, {})
+    draw.string('Hello', 0, 100)
+    assert stats.calls['string'] == 1
+    assert stats.windows > 0
+
+    draw.instrument(None)
+    stats.reset()
+    draw.fill(0)
+    assert 'fill' not in draw.__dict__
+    assert stats.windows == 0 and stats.calls == {}
+
+def test_set_window_redundant(panel):
+    display = panel.display
+    display.set_window(10, 20, 30, 40)
+    assert panel.cmds == [0x2a, 0x2b, 0x2c]
+
+    panel.cmds.clear()
+    display.set_window(10, 20, 30, 40)
+    assert panel.cmds == [0x2c]
+
+    panel.cmds.clear()
+    display.set_window(10, 21, 30, 1)
+    assert panel.cmds == [0x2b, 0x2c]
+
+    panel.cmds.clear()
+    display.set_window(0, 21, 30, 1)
+    assert panel.cmds == [0x2a, 0x2c]
+
+    # The write pointer must still be reset to the top-left corner
+    display.write_data(b'\xf8\x00\xf8\x00')
+    display.set_window(0, 21, 30, 1)
+    display.write_data(b'\x07\xe0')
+    assert panel.pixel(0, 21) == 0x07e0
+    assert panel.pixel(1, 21) == 0xf800
+
+    display.init_display()
+    panel.cmds.clear()
+    display.set_window(0, 21, 15, 1)
+    assert panel.cmds == [0x2a, 0x2b, 0x2c]
+
+def test_display_fill(panel):
+    display = panel.display
+    selects = []
+    cs = display.cs
+    def count_cs(v):
+        if not v:
+            selects.append(v)
+        cs(v)
+    display.cs = count_cs
+
+    display.fill(0x1234, 10, 20, 200, 30)
+    assert selects == [0] * 6     # 5 for the window, 1 for the pixels
+    assert panel.pixel(10, 20) == 0x1234
+    assert panel.pixel(209, 49) == 0x1234
+    assert panel.pixel(210, 49) == 0
+    assert panel.pixel(209, 50) == 0
+
+    display.fill(0)
+    assert panel.fb == bytes(len(panel.fb))
+
+def test_translate(panel):
+    display = panel.display
+    assert display.translate(10, 20) == [(10, 20)]
+
+    display.set_scroll_area(40, 160)
+    display.scroll(30)
+    assert display.scroll_offset == 30
+    assert display.translate(0, 40) == [(0, 40)]
+    assert display.translate(40, 10) == [(70, 10)]
+    assert display.translate(20, 40) == [(20, 20), (70, 20)]
+    assert display.translate(150, 80) == [(180, 20), (40, 30), (200, 30)]
+
+    display.scroll(-40)
+    assert display.scroll_offset == 150
+    assert panel.scroll == [40, 160, 190]
+
+def _stripes(draw):
+    for y in range(0, 240, 20):
+        draw.fill(y, 0, y, 240, 20)
+
+def test_scroll(panel):
+    import icons
+    draw = panel.draw
+    _stripes(draw)
+
+    exposed = []
+    def redraw():
+        exposed.append(draw._clips[-1])
+        draw.fill(0xffff)
+
+    panel.written = 0
+    draw.scroll(50, redraw)
+    assert exposed == [(0, 190, 240, 50)]
+    assert panel.written == 240 * 50
+    for y in range(190):
+        assert panel.pixel(0, y) == ((y + 50) // 20) * 20
+    for y in range(190, 240):
+        assert panel.pixel(239, y) == 0xffff
+
+    # Drawing continues to use display coordinates (even when a window
+    # has to be split because it crosses the edge of the scroll area)
+    draw.fill(0xf800, 10, 180, 20, 20)
+    draw.blit(icons.checkbox, 100, 180)
+    for y in range(180, 200):
+        assert panel.pixel(10, y) == 0xf800
+        assert panel.pixel(29, y) == 0xf800
+    assert panel.pixel(9, 180) == 220
+    assert panel.pixel(30, 199) == 0xffff
+    canvas = draw565.Canvas(panel.display, 10, 20)
+    canvas.fill(0x07e0)
+    canvas.flush(200, 185)
+    for y in range(185, 205):
+        assert panel.pixel(200, y) == 0x07e0
+
+    # Scrolling down exposes rows at the top of the display
+    draw.scroll(-20, redraw)
+    assert exposed[-1] == (0, 0, 240, 20)
+    assert panel.pixel(0, 20) == 40
+    assert panel.pixel(10, 200) == 0xf800
+
+    # Filling the whole display removes the scroll offset
+    draw.fill(0x1234)
+    assert panel.display.scroll_offset == 0
+    assert panel.scroll[2] == 0
+    assert panel.pixel(0, 0) == 0x1234
+    assert panel.fb == b'\x12\x34' * (240 * 240)
+
+def test_scroll_simulator():
+    import display as simulator
+    sim = simulator.spi_st7789_sim
+    draw = wasp.watch.drawable
+    _stripes(draw)
+
+    draw.scroll(40)
+    assert sim.vsp == 40
+    assert sim.memory_row(0) == 40
+    assert sim.display_row(40) == 0
+    assert sim.memory[0][sim.memory_row(10)] == sim.memory[0][50]
+
+    draw.fill()
+    assert sim.vsp == 0
+    assert wasp.watch.display.scroll_offset == 0
+
+def test_partial_idle(panel):
+    display = panel.display
+    panel.cmds.clear()
+    display.partial(80, 60)
+    display.idle(True)
+    assert panel.cmds == [0x30, 0x12, 0x39]
+
+    panel.cmds.clear()
+    display.idle(False)
+    display.partial(None)
+    assert panel.cmds == [0x38, 0x13]
+
+def test_ambient():
+    import display as simulator
+    from watch_faces.clock import ClockApp
+    sim = simulator.spi_st7789_sim
+    system = wasp.system
+    app = system.app
+    system.switch(ClockApp())
+
+    system.always_on = True
+    try:
+        system.sleep()
+        assert sim.partial == (80, 139)
+        assert sim.idle
+        assert not sim.mute
+
+        # After a stall the next update is at the next minute boundary
+        system._ambient_at = 0
+        system._update_ambient()
+        now = wasp.watch.rtc.time()
+        assert now < system._ambient_at <= now + 60
+        assert system._ambient_at % 60 == 0
+
+        system.wake()
+        assert sim.partial is None
+        assert not sim.idle
+    finally:
+        system.always_on = False
+
+    system.sleep()
+    assert sim.partial is None
+    assert not sim.idle
+    system.wake()
+    if app:
+        system.switch(app)
+
+@pytest.mark.parametrize('lines', (2, 5, 8))
+def test_strip_buffer(panel, lines):
+    import icons
+    strip = Panel()
+    strip.display = ST7789_SPI(strip.width, strip.height, strip,
+                               strip.cs, strip.dc, lines=lines)
+    strip.draw = draw565.Draw565(strip.display)
+    assert len(strip.display.linebuffer) == 2 * strip.width * lines
+
+    writes = []
+    for p in (panel, strip):
+        n = [0]
+        def counted(buf, write=p.display.quick_write):
+            n[0] += 1
+            write(buf)
+        p.display.quick_write = counted
+
+        draw = p.draw
+        draw.fill(0x001f)
+        draw.blit(icons.app, 20, 20)
+        draw.set_color(0xffff, 0x001f)
+        draw.string('10:09', 0, 100, width=240)
+        draw.strip_text = False
+        draw.string('Wasp', 40, 160)
+        writes.append(n[0])
+
+    assert strip.fb == panel.fb
+    assert writes[1] < writes[0]
+
+class AsyncPanel(Panel):
+    """Panel model with an asynchronous write that checks that buffers
+    are not modified while they are still being sent.
+    """
+    def __init__(self):
+        super().__init__()
+        self.inflight = None
+
+    def write_async(self, buf):
+        self.wait()
+        self.inflight = (buf, bytes(buf))
+        self.write(buf)
+
+    def wait(self):
+        if self.inflight:
+            (buf, sent) = self.inflight
+            assert bytes(buf) == sent
+            self.inflight = None
+
+@pytest.mark.parametrize('lines', (1, 4))
+def test_double_buffer(panel, lines):
+    import icons
+    from PIL import Image
+    image = _rle_encode().encode_8bit(Image.open('res/app_icon.png'))
+    tile = array.array('H', (0xf800, 0x07e0, 0x001f, 0xffff))
+
+    db = AsyncPanel()
+    db.display = ST7789_SPI(db.width, db.height, db, db.cs, db.dc,
+                            lines=lines, double_buffer=True)
+    db.draw = draw565.Draw565(db.display)
+    (a, b) = db.display.linebuffers
+    assert a is not b and len(a) == len(b) == 2 * db.width * lines
+    assert panel.display.linebuffers[0] is panel.display.linebuffers[1]
+    assert panel.display.cs == panel.cs.value
+
+    for p in (panel, db):
+        draw = p.draw
+        draw.gradient(0x001f, 0xf800)
+        draw.pattern(tile, 2, 0, 200, 240, 40)
+        draw.blit(icons.app, 20, 20, 0xffe0)
+        draw.blit(icons.app, 100, 20, scale=2)
+        draw.blit(image, 20, 120)
+        draw.blit(image, 120, 120, scale=2)
+        draw.set_color(0xffff, 0x001f)
+        draw.string('10:09', 0, 100, width=240)
+        draw.strip_text = False
+        draw.string('Wasp', 40, 160)
+    assert db.inflight is None
+    assert db.fb == panel.fb
+
+def test_spi_timing():
+    spi = wasp.watch.spi
+    assert len(wasp.watch.display.linebuffers[1]) > 0
+    spi.reset_timing()
+    wasp.watch.drawable.fill(0)
+    wasp.watch.drawable.string('Wasp', 0, 108, width=240)
+    assert spi.bus_time >= 8 * 2 * 240 * 240 / spi.baudrate
+    assert 0 < spi.stall_time < spi.bus_time
+
+def test_button_canvas():
+    import display as simulator
+    sim = simulator.spi_st7789_sim
+    plain = wasp.widgets.Button(10, 10, 40, 35, 'Mo')
+    composed = wasp.widgets.Button(10, 10, 40, 35, 'Mo', canvas=True)
+
+    plain.draw()
+    assert not plain._canvas
+    expected = sim.memory[10:50, 10:45].copy()
+    wasp.watch.drawable.fill()
+
+    composed.draw()
+    assert len(composed._canvas.buffer) == 2 * 40 * 35
+    assert (sim.memory[10:50, 10:45] == expected).all()
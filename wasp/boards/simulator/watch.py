@@ -199,7 +199,8 @@ spi.init(polarity=1, phase=1, baudrate=8000000)
 display = ST7789_SPI(240, 240, spi,
         cs=Pin("DISP_CS", Pin.OUT, quiet=True),
         dc=Pin("DISP_DC", Pin.OUT, quiet=True),
-        res=Pin("DISP_RST", Pin.OUT, quiet=True))
+        res=Pin("DISP_RST", Pin.OUT, quiet=True),
+        lines=8, double_buffer=True)
 drawable = draw565.Draw565(display)
 
 accel = Accelerometer()
@@ -9,9 +9,15 @@ import array
 import fonts.sans24
 import math
 import micropython
+import time
+import trig
 
 from micropython import const
 
+# Drawing methods that are counted by Draw565.instrument()
+_PRIMITIVES = ('blit', 'blit_file', 'circle', 'fill', 'gradient', 'line',
+               'pattern', 'polar', 'polygon', 'ring', 'rleblit', 'string')
+
 R = const(0b11111_000000_00000)
 G = const(0b00000_111111_00000)
 B = const(0b00000_000000_11111)
@@ -41,6 +47,42 @@ def _bitblit(bitbuf, pixels, bgfg: int, count: int):
             bitselect = 0x80
             pxp += 1
 
+@micropython.viper
+def _aablit(buf, pixels, lut, wbpp: int):
+    """Expand anti-aliased glyph pixels using a blend table.
+
+    wbpp holds the number of pixels to expand (shifted left by 3) together
+    with the number of bits per pixel.
+    """
+    mv = ptr16(buf)
+    px = ptr8(pixels)
+    blend = ptr16(lut)
+    bpp = wbpp & 7
+    mask = (1 << bpp) - 1
+    top = 8 - bpp
+    shift = top
+    pxp = 0
+
+    for i in range(wbpp >> 3):
+        mv[i] = blend[(px[pxp] >> shift) & mask]
+        shift -= bpp
+        if shift < 0:
+            shift = top
+            pxp += 1
+
+@micropython.viper
+def _stretch(buf, count: int, scale: int):
+    """Replicate each of the first count pixels in buf, in place."""
+    p = ptr16(buf)
+    i = count - 1
+    o = count * scale - 1
+    while i >= 0:
+        px = p[i]
+        for k in range(scale):
+            p[o] = px
+            o -= 1
+        i -= 1
+
 @micropython.viper
 def _clut8_rgb565(i: int) -> int:
     if i < 216:
@@ -62,6 +104,106 @@ def _clut8_rgb565(i: int) -> int:
 
     return rgb565
 
+@micropython.viper
+def _decode8bit(buf, rle, state, clut) -> int:
+    """Decode pixels from an 8-bit RLE image into buf.
+
+    The decoder state (stream offset, stream limit, pending colour, pending
+    run length, number of pixels to decode and stream length) is kept in
+    state allowing a single image to be decoded a chunk at a time. No new
+    run is started at or beyond the stream limit, which allows a partially
+    loaded stream to be refilled between calls. clut must be a byte-swapped
+    copy of the CLUT.
+    """
+    p = ptr16(buf)
+    src = ptr8(rle)
+    st = ptr32(state)
+    lut = ptr16(clut)
+    i = int(st[0])
+    n = int(st[1])
+    color = int(st[2])
+    run = int(st[3])
+    sz = int(st[4])
+    end = int(st[5])
+    bp = 0
+
+    while bp < sz:
+        if run == 0:
+            if i >= n:
+                break
+            px = int(src[i])
+            i += 1
+            color = int(lut[px])
+            run = 1
+            if i < end and int(src[i]) == px:
+                i += 1
+                count = 0
+                op = 0x80
+                while op & 0x80:
+                    op = int(src[i])
+                    i += 1
+                    count = (count << 7) + (op & 0x7f)
+                run = count + 2
+
+        count = sz - bp
+        if run < count:
+            count = run
+        for x in range(bp, bp+count):
+            p[x] = color
+        bp += count
+        run -= count
+
+    st[0] = i
+    st[2] = color
+    st[3] = run
+    return bp
+
+_clut8 = None
+
+def _clut8_swapped():
+    """Get a byte-swapped copy of the CLUT (generating it if needed)."""
+    global _clut8
+    if not _clut8:
+        _clut8 = array.array('H', [0] * 256)
+        for i in range(256):
+            c = _clut8_rgb565(i)
+            _clut8[i] = ((c >> 8) & 0xff) + ((c & 0xff) << 8)
+    return _clut8
+
+_CHUNK_SIZE = const(128)
+# Longest 8-bit RLE op: two pixels and a three byte run length
+_MAX_OP = const(5)
+_chunk = None
+
+def _file_chunk():
+    """Get the buffer used to stream images from files (allocating it if
+    needed)."""
+    global _chunk
+    if not _chunk:
+        _chunk = bytearray(_CHUNK_SIZE)
+    return _chunk
+
+def _refill(f, chunk, state):
+    """Top up a partially consumed 8-bit RLE stream from a file.
+
+    Any unconsumed bytes are moved to the start of the chunk and the
+    rest of the chunk is loaded from the file. The stream limit is set so
+    that _decode8bit() will not start an op that may have been truncated.
+
+    :returns: False if the end of the file has been reached
+    """
+    i = state[0]
+    end = state[5]
+    tail = end - i
+    if tail:
+        chunk[0:tail] = chunk[i:end]
+    n = f.readinto(memoryview(chunk)[tail:])
+    end = tail + n
+    state[0] = 0
+    state[1] = max(0, end - _MAX_OP) if n else end
+    state[5] = end
+    return bool(n)
+
 @micropython.viper
 def _fill(mv, color: int, count: int, offset: int):
     p = ptr16(mv)
@@ -70,36 +212,943 @@ def _fill(mv, color: int, count: int, offset: int):
     for x in range(offset, offset+count):
         p[x] = color
 
+@micropython.viper
+def _lerp565(colors: int, i: int, n: int) -> int:
+    """Interpolate between two RGB565 colours.
+
+    colors holds the start colour in the top 16 bits and the end colour in
+    the bottom 16 bits. Returns the colour i steps along a gradient that
+    reaches the end colour after n steps.
+    """
+    c0 = (colors >> 16) & 0xffff
+    c1 = colors & 0xffff
+    if n <= 0:
+        return c0
+    half = n >> 1
+
+    a = c0 >> 11
+    b = c1 >> 11
+    if b >= a:
+        c = (a + ((b - a) * i + half) // n) << 11
+    else:
+        c = (a - ((a - b) * i + half) // n) << 11
+
+    a = (c0 >> 5) & 0x3f
+    b = (c1 >> 5) & 0x3f
+    if b >= a:
+        c |= (a + ((b - a) * i + half) // n) << 5
+    else:
+        c |= (a - ((a - b) * i + half) // n) << 5
+
+    a = c0 & 0x1f
+    b = c1 & 0x1f
+    if b >= a:
+        c |= a + ((b - a) * i + half) // n
+    else:
+        c |= a - ((a - b) * i + half) // n
+    return c
+
+@micropython.viper
+def _ramp(buf, colors: int, count: int):
+    """Fill buf with a (byte-swapped) gradient of count pixels."""
+    p = ptr16(buf)
+    n = count - 1
+    for x in range(count):
+        c = int(_lerp565(colors, x, n))
+        p[x] = ((c >> 8) & 0xff) + ((c & 0xff) << 8)
+
+@micropython.viper
+def _tile(buf, tile, start_tw: int, count: int):
+    """Fill buf with count pixels by repeating a single row of a tile.
+
+    start_tw holds the index of the first pixel of the row in the top bits
+    and the width of the tile in the bottom eight bits. The tile contains
+    native (not byte-swapped) RGB565 pixels.
+    """
+    p = ptr16(buf)
+    t = ptr16(tile)
+    start = start_tw >> 8
+    tw = start_tw & 0xff
+    i = 0
+    for x in range(count):
+        c = t[start + i]
+        p[x] = ((c >> 8) & 0xff) + ((c & 0xff) << 8)
+        i += 1
+        if i >= tw:
+            i = 0
+
 def _bounding_box(s, font):
     if not s:
         return (0, font.height())
 
-    get_ch = font.get_ch
-    w = len(s)
-    for ch in s:
-        (_, h, wc) = get_ch(ch)
-        w += wc
+    return (fonts.width(font, s), font.height())
+
+def _blend_table(bgfg, bpp):
+    """Calculate the (byte-swapped) colours for each level of coverage."""
+    levels = (1 << bpp) - 1
+    fg = bgfg & 0xffff
+    bg = bgfg >> 16
+    lut = array.array('H', [0] * (levels + 1))
+    for i in range(levels + 1):
+        c = 0
+        for (shift, mask) in ((11, 0x1f), (5, 0x3f), (0, 0x1f)):
+            f = (fg >> shift) & mask
+            b = (bg >> shift) & mask
+            c |= (b + ((f - b) * i + (levels >> 1)) // levels) << shift
+        lut[i] = ((c >> 8) & 0xff) + ((c & 0xff) << 8)
+    return lut
 
-    return (w, h)
+@micropython.native
+def _expand(buf, px, row, w, bgfg, aa):
+    """Expand a single row of a glyph into RGB565 pixels."""
+    if aa:
+        (lut, bpp) = aa
+        _aablit(buf, px[row*((w*bpp + 7) // 8):], lut, (w << 3) + bpp)
+    else:
+        _bitblit(buf, px[row*((w + 7) // 8):], bgfg, w)
+
+def _buffers(display, sz):
+    """Get the pair of line buffers, trimmed to sz bytes.
+
+    Rows must be drawn into the buffers alternately because, if the
+    display is double buffered, the other buffer may still be being sent.
+    """
+    (a, b) = display.linebuffers
+    if a is b:
+        a = a[0:sz]
+        return (a, a)
+    return (a[0:sz], b[0:sz])
 
 @micropython.native
-def _draw_glyph(display, glyph, x, y, bgfg):
+def _draw_glyph(display, glyph, x, y, bgfg, aa):
     (px, h, w) = glyph
 
-    buf = display.linebuffer[0:2*(w+1)]
-    buf[2*w] = bgfg >> 24
-    buf[2*w + 1] = (bgfg >> 16) & 0xff
-    bytes_per_row = (w + 7) // 8
+    # Expand as many rows as will fit in the line buffer before each write
+    stride = 2 * (w+1)
+    lines = max(1, min(h, len(display.linebuffer) // stride))
+    bufs = _buffers(display, stride*lines)
+    for buf in bufs:
+        for i in range(stride - 2, len(buf), stride):
+            buf[i] = bgfg >> 24
+            buf[i + 1] = (bgfg >> 16) & 0xff
 
     display.set_window(x, y, w+1, h)
     quick_write = display.quick_write
 
     display.quick_start()
+    flip = 0
+    buf = bufs[0]
+    offset = 0
+    for row in range(h):
+        _expand(buf[offset:], px, row, w, bgfg, aa)
+        offset += stride
+        if offset >= len(buf):
+            quick_write(buf)
+            flip ^= 1
+            buf = bufs[flip]
+            offset = 0
+    if offset:
+        quick_write(buf[0:offset])
+    display.quick_end()
+
+@micropython.native
+def _draw_strip(display, font, s, x, y, width, leftpad, bgfg, aa, cache):
+    # Gather (pixels, width, cached) for every glyph on the line. Cached
+    # glyphs are already expanded to RGB565 and include the spacing column.
+    glyphs = []
+    for ch in s:
+        glyph = cache.get(font, ch, bgfg, aa) if cache else None
+        if glyph:
+            glyphs.append((memoryview(glyph[0]), glyph[1], True))
+        else:
+            glyph = font.get_ch(ch)
+            glyphs.append((glyph[0], glyph[2], False))
+    h = font.height()
+
+    # The padding and the spacing between glyphs are never overwritten so
+    # they only need to be filled once. As many rows as will fit in the
+    # line buffer are rendered before each write.
+    lines = max(1, min(h, len(display.linebuffer) // (2*width)))
+    bufs = _buffers(display, 2*width*lines)
+    for buf in bufs:
+        _fill(buf, bgfg >> 16, width*lines, 0)
+
+    display.set_window(x, y, width, h)
+    quick_write = display.quick_write
+
+    display.quick_start()
+    flip = 0
+    buf = bufs[0]
+    base = 0
     for row in range(h):
-        _bitblit(buf, px[row*bytes_per_row:], bgfg, w)
+        offset = base + 2 * leftpad
+        for (px, w, cached) in glyphs:
+            if cached:
+                stride = 2 * w
+                buf[offset:offset+stride] = px[row*stride:(row+1)*stride]
+                offset += stride
+            else:
+                _expand(buf[offset:], px, row, w, bgfg, aa)
+                offset += 2 * (w+1)
+        base += 2 * width
+        if base >= len(buf):
+            quick_write(buf)
+            flip ^= 1
+            buf = bufs[flip]
+            base = 0
+    if base:
+        quick_write(buf[0:base])
+    display.quick_end()
+
+def _rle2bit_spans(image, fg, c1, c2):
+    """Compile a 2-bit RLE image into (colour, run length) spans."""
+    spans = array.array('H')
+    palette = [0, c1, c2, fg]
+    next_color = 1
+    rl = 0
+    color = -1
+    run = 0
+
+    for op in memoryview(image)[3:]:
+        if rl == 0:
+            px = op >> 6
+            rl = op & 0x3f
+            if 0 == rl:
+                rl = -1
+                continue
+            if rl >= 63:
+                continue
+        elif rl > 0:
+            rl += op
+            if op >= 255:
+                continue
+        else:
+            palette[next_color] = _clut8_rgb565(op)
+            if next_color < 3:
+                next_color += 1
+            else:
+                next_color = 1
+            rl = 0
+            continue
+
+        # Merge runs that resolve to the same colour
+        if palette[px] == color:
+            run += rl
+        else:
+            if run:
+                spans.append(color)
+                spans.append(run)
+            color = palette[px]
+            run = rl
+        rl = 0
+
+    if run:
+        spans.append(color)
+        spans.append(run)
+    return spans
+
+@micropython.native
+def _blit_spans(display, spans, x, y, sx, sy):
+    display.set_window(x, y, sx, sy)
+    bufs = display.linebuffers
+    flip = 0
+    buf = bufs[0]
+    sz = len(buf) // 2
+    quick_write = display.quick_write
+    bp = 0
+
+    display.quick_start()
+    for i in range(0, len(spans), 2):
+        color = spans[i]
+        rl = spans[i+1]
+        while rl:
+            count = min(sz - bp, rl)
+            _fill(buf, color, count, bp)
+            bp += count
+            rl -= count
+
+            if bp >= sz:
+                quick_write(buf)
+                flip ^= 1
+                buf = bufs[flip]
+                bp = 0
+    if bp:
+        quick_write(buf[0:2*bp])
+    display.quick_end()
+
+@micropython.native
+def _span(display, buf, x, y, w, h):
+    """Fill a rectangle from a line buffer that is already full of colour."""
+    quick_write = display.quick_write
+    sz = len(buf) // 2
+    remaining = w * h
+
+    display.set_window(x, y, w, h)
+    display.quick_start()
+    while remaining > sz:
         quick_write(buf)
+        remaining -= sz
+    quick_write(buf[0:2*remaining])
     display.quick_end()
 
+@micropython.native
+def _hline(display, buf, x0, y0, x1, y1):
+    """Draw a thin, mostly horizontal, line as a series of horizontal runs."""
+    if x0 > x1:
+        x0, x1 = x1, x0
+        y0, y1 = y1, y0
+    dx = x1 - x0
+    dy = abs(y1 - y0)
+    sy = 1 if y0 < y1 else -1
+    err = dx // 2
+    start = x0
+
+    for x in range(x0, x1+1):
+        err -= dy
+        if err < 0:
+            _span(display, buf, start, y0, x - start + 1, 1)
+            y0 += sy
+            err += dx
+            start = x + 1
+    if start <= x1:
+        _span(display, buf, start, y0, x1 - start + 1, 1)
+
+@micropython.native
+def _vline(display, buf, x0, y0, x1, y1):
+    """Draw a thin, mostly vertical, line as a series of vertical runs."""
+    if y0 > y1:
+        x0, x1 = x1, x0
+        y0, y1 = y1, y0
+    dx = abs(x1 - x0)
+    dy = y1 - y0
+    sx = 1 if x0 < x1 else -1
+    err = dy // 2
+    start = y0
+
+    for y in range(y0, y1+1):
+        err -= dx
+        if err < 0:
+            _span(display, buf, x0, start, 1, y - start + 1)
+            x0 += sx
+            err += dy
+            start = y + 1
+    if start <= y1:
+        _span(display, buf, x0, start, 1, y1 - start + 1)
+
+@micropython.native
+def _polygon(display, buf, pts):
+    """Scan convert a convex polygon.
+
+    The vertices are provided as a flat list of x and y coordinates measured
+    in 1/16ths of a pixel. A pixel is filled if its centre lies within the
+    polygon. The spans are clipped to the edges of the display.
+    """
+    width = display.width
+    n = len(pts)
+    ymin = pts[1]
+    ymax = pts[1]
+    for i in range(3, n, 2):
+        if pts[i] < ymin:
+            ymin = pts[i]
+        if pts[i] > ymax:
+            ymax = pts[i]
+
+    for row in range(max((ymin + 7) // 16, 0),
+                     min((ymax + 7) // 16, display.height)):
+        yc = 16 * row + 8
+        xl = 0x3fffffff
+        xr = -xl
+        xa = pts[n-2]
+        ya = pts[n-1]
+        for i in range(0, n, 2):
+            xb = pts[i]
+            yb = pts[i+1]
+            if (ya <= yc < yb) or (yb <= yc < ya):
+                x = xa + (xb - xa) * (yc - ya) // (yb - ya)
+                if x < xl:
+                    xl = x
+                if x > xr:
+                    xr = x
+            xa = xb
+            ya = yb
+
+        left = max((xl + 7) // 16, 0)
+        right = min((xr + 7) // 16, width)
+        if right > left:
+            _span(display, buf, left, row, right - left, 1)
+
+@micropython.native
+def _isqrt(n):
+    """Integer square root (rounded down)."""
+    if n < 2:
+        return n
+    x = n
+    y = (x + 1) // 2
+    while y < x:
+        x = y
+        y = (x + n // x) // 2
+    return x
+
+@micropython.native
+def _half(k, m, lo, hi):
+    """Clip the run [lo, hi] to the pixels where k*x + m >= 0."""
+    if k > 0:
+        lo = max(lo, -(m // k))
+    elif k < 0:
+        hi = min(hi, m // -k)
+    elif m < 0:
+        hi = lo - 1
+    return (lo, hi)
+
+@micropython.native
+def _sector(display, buf, x, y, dy, lo, hi, sector):
+    """Draw the part of a horizontal run that lies within a sector.
+
+    The run is on row dy and covers pixels lo to hi (inclusive), all
+    measured relative to the centre of the sector, (x, y). The sector is
+    described by the direction vectors of its clockwise (ax, ay) and
+    anticlockwise (bx, by) edges together with a flag that is set if the
+    sector is wider than a semi-circle.
+    """
+    (ax, ay, bx, by, wide) = sector
+    (l1, r1) = _half(-ay, ax * dy, lo, hi)
+    (l2, r2) = _half(by, -bx * dy, lo, hi)
+    if not wide:
+        l1 = max(l1, l2)
+        r1 = min(r1, r2)
+    elif r1 < l1:
+        (l1, r1) = (l2, r2)
+    elif l2 <= r2:
+        if l2 > r1 + 1 or l1 > r2 + 1:
+            _span(display, buf, x + l2, y + dy, r2 - l2 + 1, 1)
+        else:
+            l1 = min(l1, l2)
+            r1 = max(r1, r2)
+    if r1 >= l1:
+        _span(display, buf, x + l1, y + dy, r1 - l1 + 1, 1)
+
+@micropython.native
+def _ring(display, buf, x, y, r0, r1, sector):
+    """Scan convert a (partial) ring centred on pixel (x, y).
+
+    A pixel is drawn if it is within the circle of radius r1 but not
+    within the circle of radius r0 - 1. Each row of the ring results in,
+    at most, two horizontal runs.
+    """
+    outer = r1 * r1 + r1
+    inner = r0 * r0 - r0 if r0 > 0 else -1
+    h = 0
+    g = 0
+    for dy in range(-r1, r1+1):
+        d = dy * dy
+        while (h+1) * (h+1) <= outer - d:
+            h += 1
+        while h * h > outer - d:
+            h -= 1
+
+        if d > inner:
+            runs = ((-h, h),)
+        else:
+            while (g+1) * (g+1) <= inner - d:
+                g += 1
+            while g * g > inner - d:
+                g -= 1
+            runs = ((-h, -g-1), (g+1, h))
+
+        for (lo, hi) in runs:
+            if hi < lo:
+                continue
+            if sector:
+                _sector(display, buf, x, y, dy, lo, hi, sector)
+            else:
+                _span(display, buf, x + lo, y + dy, hi - lo + 1, 1)
+
+class _LRUCache(object):
+    """Byte budgeted cache with least recently used eviction.
+
+    Entries are lists whose last two elements are the size of the entry,
+    in bytes, and the time it was last used.
+    """
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.clear()
+
+    def clear(self):
+        """Drop all cached entries and reset the statistics."""
+        self._entries = {}
+        self._age = 0
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key):
+        self._age += 1
+        entry = self._entries.get(key)
+        if entry:
+            entry[-1] = self._age
+        return entry
+
+    def _reserve(self, sz):
+        """Make room for a new entry, returns False if it can never fit."""
+        if sz > self.budget:
+            return False
+        while self.used + sz > self.budget:
+            self._evict()
+        return True
+
+    def _insert(self, key, entry, sz):
+        entry.append(sz)
+        entry.append(self._age)
+        self._entries[key] = entry
+        self.used += sz
+        return entry
+
+    def _evict(self):
+        """Discard the least recently used entry."""
+        entries = self._entries
+        oldest = None
+        for key in entries:
+            if oldest is None or entries[key][-1] < entries[oldest][-1]:
+                oldest = key
+        self.used -= entries.pop(oldest)[-2]
+
+class GlyphCache(_LRUCache):
+    """Cache of pre-rendered RGB565 glyphs.
+
+    Each entry holds every pixel row of a glyph (including the single column
+    of inter-character spacing) rendered in a specific pair of colours. This
+    allows repeated text to be sent to the display as a single write without
+    re-running the bit expander.
+
+    The cache is bounded by a byte budget and, when full, evicts the least
+    recently used glyphs.
+
+    .. automethod:: __init__
+    """
+
+    def __init__(self, budget=4096):
+        """Create an empty cache.
+
+        :param int budget: Maximum number of bytes of pixel data to retain
+        """
+        super().__init__(budget)
+
+    def get(self, font, ch, bgfg, aa=None):
+        """Lookup (and, if needed, render) a glyph.
+
+        :param font: Font module the glyph should be drawn from
+        :param ch:   Character to lookup
+        :param bgfg: Packed background and foreground colour
+        :param aa:   Blend table and bits per pixel for anti-aliased fonts
+        :returns:    Sequence starting (pixels, width, height) or None if the
+                     glyph is too large to be cached. The width includes the
+                     spacing column.
+        """
+        key = (id(font), ch, bgfg)
+        entry = self._lookup(key)
+        if entry:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        (px, h, w) = font.get_ch(ch)
+        sz = 2 * (w+1) * h
+        if not self._reserve(sz):
+            return None
+
+        pixels = bytearray(sz)
+        mv = memoryview(pixels)
+        stride = 2 * (w+1)
+        for row in range(h):
+            offset = row * stride
+            _expand(mv[offset:], px, row, w, bgfg, aa)
+            pixels[offset + 2*w] = bgfg >> 24
+            pixels[offset + 2*w + 1] = (bgfg >> 16) & 0xff
+
+        return self._insert(key, [pixels, w+1, h], sz)
+
+class ImageCache(_LRUCache):
+    """Cache of pre-decoded 2-bit RLE images.
+
+    Decoding a 2-bit RLE image requires every opcode to be parsed, including
+    the palette escapes. This cache compiles an image, for a specific set of
+    colours, into an array of (RGB565 colour, run length) spans that can be
+    replayed directly into the display's line buffer.
+
+    Images are identified by the image object itself (not its contents) so
+    the cache is intended for icons that live for the whole time the watch
+    is running.
+
+    The cache is bounded by a byte budget and, when full, evicts the least
+    recently used images. The memory currently in use is available in the
+    ``used`` attribute.
+
+    .. automethod:: __init__
+    """
+
+    def __init__(self, budget=2048):
+        """Create an empty cache.
+
+        :param int budget: Maximum number of bytes of span data to retain
+        """
+        super().__init__(budget)
+
+    def get(self, image, fg, c1, c2):
+        """Lookup (and, if needed, compile) an image.
+
+        :param image: 2-bit RLE image
+        :param fg:    Foreground colour
+        :param c1:    Colour of the first palette entry
+        :param c2:    Colour of the second palette entry
+        :returns:     Span array or None if the image is too large to cache
+        """
+        key = (id(image), fg, c1, c2)
+        entry = self._lookup(key)
+        if entry and entry[1] is image:
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        spans = _rle2bit_spans(image, fg, c1, c2)
+        sz = 2 * len(spans)
+        if entry:
+            self.used -= entry[-2]
+            del self._entries[key]
+        if not self._reserve(sz):
+            return None
+
+        return self._insert(key, [spans, image], sz)[0]
+
+def _contains(a, b):
+    """Check whether rectangle a completely covers rectangle b."""
+    return (a[0] <= b[0] and a[1] <= b[1] and
+            b[0] + b[2] <= a[0] + a[2] and b[1] + b[3] <= a[1] + a[3])
+
+def _overlaps(a, b):
+    return (a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and
+            a[1] < b[1] + b[3] and b[1] < a[1] + a[3])
+
+def _merge(a, b):
+    """Merge two same colour fills whose union is a rectangle.
+
+    On success a is updated to cover both rectangles.
+    """
+    if a[4] is not None or b[4] is not None or a[5] != b[5]:
+        return False
+    if a[1] == b[1] and a[3] == b[3]:
+        (i, j) = (0, 2)
+    elif a[0] == b[0] and a[2] == b[2]:
+        (i, j) = (1, 3)
+    else:
+        return False
+    if a[i] > b[i] + b[j] or b[i] > a[i] + a[j]:
+        return False
+    end = max(a[i] + a[j], b[i] + b[j])
+    a[i] = min(a[i], b[i])
+    a[j] = end - a[i]
+    return True
+
+def _optimize(ops):
+    """Reduce a display list to the smallest set of equivalent operations.
+
+    Each operation is a list of [x, y, w, h, method, args] where the
+    rectangle is the region the operation paints (every pixel of it) and
+    a method of None means fill with the colour in args.
+
+    Operations that are completely overdrawn by a later operation are
+    dropped. Fills of the same colour are merged if their union is a
+    rectangle and the merge does not reorder them with respect to any
+    operation that they overlap.
+    """
+    ops = [op for op in ops if op[2] > 0 and op[3] > 0]
+
+    changed = True
+    while changed:
+        changed = False
+
+        n = len(ops)
+        i = 0
+        while i < n:
+            for j in range(i+1, n):
+                if _contains(ops[j], ops[i]):
+                    del ops[i]
+                    n -= 1
+                    break
+            else:
+                i += 1
+
+        for i in range(n):
+            for j in range(i+1, n):
+                a = ops[i]
+                b = ops[j]
+                if a[4] is not None or b[4] is not None or a[5] != b[5]:
+                    continue
+
+                # Try to move a forward to b and, if that is blocked, move b
+                # back to a instead
+                between = ops[i+1:j]
+                for op in between:
+                    if _overlaps(op, a):
+                        break
+                else:
+                    if _merge(b, a):
+                        del ops[i]
+                        changed = True
+                        break
+                    continue
+                for op in between:
+                    if _overlaps(op, b):
+                        break
+                else:
+                    if _merge(a, b):
+                        del ops[j]
+                        changed = True
+                        break
+            if changed:
+                break
+
+    return ops
+
+def _intersect(clip, x, y, w, h):
+    """Clip the rectangle (x, y, w, h) to the clip rectangle."""
+    (cx, cy, cw, ch) = clip
+    x1 = min(x + w, cx + cw)
+    y1 = min(y + h, cy + ch)
+    x = max(x, cx)
+    y = max(y, cy)
+    return (x, y, max(x1 - x, 0), max(y1 - y, 0))
+
+class _Clip(object):
+    """Display wrapper that discards writes outside of the clip rectangle.
+
+    Windows are clipped before they are sent to the display and pixel
+    data is tracked against the original window so only the visible parts
+    of each row are written (and rows outside the clip rectangle are
+    skipped entirely). Windows that lie completely within the clip
+    rectangle are passed straight through.
+    """
+
+    def __init__(self, display, clip):
+        self.display = display
+        self.width = display.width
+        self.height = display.height
+        self.linebuffer = display.linebuffer
+        self.linebuffers = display.linebuffers
+        self.clip = clip
+        self._window = (0, 0, 0, 0)
+        self._visible = None
+
+    def set_window(self, x, y, width, height):
+        (vx, vy, vw, vh) = _intersect(self.clip, x, y, width, height)
+        self._window = (x, y, width, height)
+        self._col = 0
+        self._row = 0
+        if vw and vh:
+            self.display.set_window(vx, vy, vw, vh)
+        if vw == width and vh == height:
+            self._visible = None
+        else:
+            self._visible = (vx - x, vy - y, vx - x + vw, vy - y + vh)
+
+    def quick_start(self):
+        self.display.quick_start()
+
+    def quick_end(self):
+        self.display.quick_end()
+
+    def quick_write(self, data):
+        if self._visible:
+            self._write(self.display.quick_write, data)
+        else:
+            self.display.quick_write(data)
+
+    def write_data(self, data):
+        if self._visible:
+            self._write(self.display.write_data, data)
+        else:
+            self.display.write_data(data)
+
+    @micropython.native
+    def _write(self, write, data):
+        (left, top, right, bottom) = self._visible
+        w = self._window[2]
+        h = self._window[3]
+        col = self._col
+        row = self._row
+        sz = len(data) // 2
+        i = 0
+
+        while i < sz:
+            count = min(w - col, sz - i)
+            if top <= row < bottom:
+                l = max(col, left)
+                r = min(col + count, right)
+                if r > l:
+                    write(data[2*(i + l - col):2*(i + r - col)])
+
+            i += count
+            col += count
+            if col >= w:
+                col = 0
+                row += 1
+                if row >= h:
+                    row = 0
+
+        self._col = col
+        self._row = row
+
+class _Scroll(object):
+    """Display wrapper that draws on a display that has been scrolled.
+
+    Windows are translated into frame memory coordinates before they are
+    sent to the display. A window that crosses an edge of the scroll area
+    is split into several windows and the pixel data is sent to each of
+    them in turn.
+    """
+
+    def __init__(self, display):
+        self.display = display
+        self.width = display.width
+        self.height = display.height
+        self.linebuffer = display.linebuffer
+        self.linebuffers = display.linebuffers
+        self._pieces = None
+        self._quick = False
+
+    def set_window(self, x, y, width, height):
+        pieces = self.display.translate(y, height)
+        (fy, rows) = pieces.pop(0)
+        self.display.set_window(x, fy, width, rows)
+        if pieces:
+            self._pieces = pieces
+            self._x = x
+            self._width = width
+            self._left = 2 * width * rows
+        else:
+            self._pieces = None
+
+    def quick_start(self):
+        self._quick = True
+        self.display.quick_start()
+
+    def quick_end(self):
+        self._quick = False
+        self.display.quick_end()
+
+    def quick_write(self, data):
+        if self._pieces:
+            self._write(self.display.quick_write, data)
+        else:
+            self.display.quick_write(data)
+
+    def write_data(self, data):
+        if self._pieces:
+            self._write(self.display.write_data, data)
+        else:
+            self.display.write_data(data)
+
+    def _write(self, write, data):
+        display = self.display
+        pieces = self._pieces
+        n = len(data)
+        i = 0
+
+        while pieces and n - i > self._left:
+            left = self._left
+            write(data[i:i+left])
+            i += left
+
+            (fy, rows) = pieces.pop(0)
+            if self._quick:
+                display.quick_end()
+            display.set_window(self._x, fy, self._width, rows)
+            if self._quick:
+                display.quick_start()
+            self._left = 2 * self._width * rows
+
+        write(data[i:] if i else data)
+        self._left -= n - i
+
+class Stats(object):
+    """Rendering counters.
+
+    Pass a Stats object to :py:meth:`Draw565.instrument` to find out how
+    much it costs to draw a frame:
+
+    .. code-block:: python
+
+        stats = draw565.Stats(timing=True)
+        wasp.watch.drawable.instrument(stats)
+        wasp.system.switch(wasp.system.applications[0])
+        print(stats)
+
+    .. attribute:: windows
+
+        Number of windows (set_window() calls) sent to the display
+
+    .. attribute:: cmds
+
+        Number of commands sent to the display (including the three
+        commands needed by each window)
+
+    .. attribute:: bytes
+
+        Number of bytes sent to the display (commands and data)
+
+    .. attribute:: calls
+
+        Dictionary of calls to each drawing primitive
+
+    .. attribute:: us
+
+        Dictionary of time spent in each drawing primitive, in
+        microseconds (only updated if timing is enabled)
+
+    .. automethod:: __init__
+    """
+    def __init__(self, timing=False):
+        """Create a new set of counters.
+
+        :param timing: Measure the time spent in each drawing primitive
+        """
+        self.timing = timing
+        self.calls = {}
+        self.us = {}
+        self.reset()
+
+    def reset(self):
+        """Zero all the counters (typically at the start of a frame)."""
+        self.windows = 0
+        self.cmds = 0
+        self.bytes = 0
+        self.calls.clear()
+        self.us.clear()
+
+    def __repr__(self):
+        return '<Stats windows={} cmds={} bytes={} calls={} us={}>'.format(
+                self.windows, self.cmds, self.bytes, self.calls, self.us)
+
+def _counted(stats, name, fn):
+    """Wrap a drawing primitive so that calls to it are counted."""
+    calls = stats.calls
+    us = stats.us
+
+    if not stats.timing:
+        def counted(*args, **kwargs):
+            calls[name] = calls.get(name, 0) + 1
+            return fn(*args, **kwargs)
+        return counted
+
+    def timed(*args, **kwargs):
+        calls[name] = calls.get(name, 0) + 1
+        t = time.ticks_us()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            us[name] = us.get(name, 0) + time.ticks_diff(time.ticks_us(), t)
+    return timed
+
 class Draw565(object):
     """Drawing library for RGB565 displays.
 
@@ -116,15 +1165,63 @@ class Draw565(object):
         and 24pt Sans Serif text.
         """
         self._display = display
+        self.glyph_cache = None
+        self.image_cache = None
+        self.strip_text = True
+        self._texts = {}
+        self._batch = None
+        self._depth = 0
+        self._eliminated = 0
+        self._clips = []
+        self._blends = {}
+        self._quad = array.array('i', bytes(32))
         self.reset()
 
     def reset(self):
         """Restore the default colours and font.
 
         Default colours are white-on-block (white foreground, black
-        background) and the default font is 24pt Sans Serif."""
+        background) and the default font is 24pt Sans Serif.
+
+        Any strings remembered by :py:meth:`~.update_string` are forgotten,
+        any operations recorded since an unmatched :py:meth:`~.begin` are
+        discarded and any clip rectangles are removed."""
         self.set_color(0xffff)
         self.set_font(fonts.sans24)
+        self._texts = {}
+        self._batch = None
+        self._depth = 0
+        if self._clips:
+            self._display = self._display.display
+            self._clips = []
+
+    def instrument(self, stats):
+        """Count the drawing operations and the traffic they generate.
+
+        Instrumentation is opt-in and has no cost when disabled. When
+        enabled, calls to each drawing primitive are counted (and,
+        optionally, timed) and, if the display driver supports it, the
+        windows, commands and bytes sent to the display are counted too.
+
+        Primitives that call other primitives (for example
+        :py:meth:`~.string` filling in the padding around the text) count
+        the nested calls as well. In batch mode each operation is counted
+        once when it is recorded and again if it is replayed.
+
+        :param stats: :py:class:`Stats` to update or None to disable the
+                      instrumentation.
+        """
+        for name in _PRIMITIVES:
+            try:
+                delattr(self, name)
+            except AttributeError:
+                pass
+            if stats:
+                setattr(self, name, _counted(stats, name, getattr(self, name)))
+
+        display = self._base()
+        if hasattr(display, 'instrument'):
+            display.instrument(stats)
 
     def fill(self, bg=None, x=0, y=0, w=None, h=None):
         """Draw a solid colour rectangle.
@@ -141,7 +1238,6 @@ class Draw565(object):
                    the bottom-most pixel of the display)
         """
         display = self._display
-        quick_write = display.quick_write
 
         if bg is None:
             bg = self._bgfg >> 16
@@ -149,11 +1245,27 @@ class Draw565(object):
             w = display.width - x
         if h is None:
             h = display.height - y
+        whole = w == display.width and h == display.height and \
+                not self._clips
+
+        # Filling the whole display erases any remembered strings
+        if self._texts and whole:
+            self._texts = {}
+
+        if self._batch is not None:
+            self._batch.append([x, y, w, h, None, bg])
+            return
+
+        # Rectangles are easy to clip so we can bypass the clipping wrapper
+        if self._clips:
+            (x, y, w, h) = _intersect(self._clips[-1], x, y, w, h)
+            display = display.display
 
         remaining = w * h
         if remaining == 0:
           return
 
+        quick_write = display.quick_write
         display.set_window(x, y, w, h)
 
         # Populate the line buffer
@@ -169,48 +1281,436 @@ class Draw565(object):
             quick_write(buf[0:2*remaining])
         display.quick_end()
 
+        # Once the display is a single colour the scroll offset can be
+        # removed without anybody noticing
+        if whole and isinstance(display, _Scroll):
+            self._unscroll()
+
+    def _area(self, x, y, w, h):
+        """Fill in the default size of a rectangle (as used by fill())."""
+        display = self._display
+        if w is None:
+            w = display.width - x
+        if h is None:
+            h = display.height - y
+
+        # Covering the whole display erases any remembered strings
+        if self._texts and w == display.width and h == display.height and \
+                not self._clips:
+            self._texts = {}
+
+        return (x, y, w, h)
+
+    def _rows(self, x, y, w, h):
+        """Prepare to draw a rectangle one row at a time.
+
+        :returns: The pair of line buffers (trimmed to the width of the
+                  rectangle) or None if the rectangle is not visible
+        """
+        display = self._display
+        if self._clips and not _intersect(self._clips[-1], x, y, w, h)[2]:
+            return None
+        if w <= 0 or h <= 0:
+            return None
+        if w > len(display.linebuffer) // 2:
+            raise ValueError('rectangle is too wide')
+
+        display.set_window(x, y, w, h)
+        return _buffers(display, 2*w)
+
+    @micropython.native
+    def gradient(self, start, end, x=0, y=0, w=None, h=None,
+                 horizontal=False):
+        """Draw a rectangle filled with a linear gradient.
+
+        Each row is generated directly into the line buffer so a gradient
+        background costs no more than a single window and one write per
+        row.
+
+        :param start:      Colour of the top (or left-most) pixels
+        :param end:        Colour of the bottom (or right-most) pixels
+        :param x:          X coordinate of the left-most pixels of the
+                           rectangle
+        :param y:          Y coordinate of the top-most pixels of the
+                           rectangle
+        :param w:          Width of the rectangle, defaults to None (which
+                           means select the right-most pixel of the display)
+        :param h:          Height of the rectangle, defaults to None (which
+                           means select the bottom-most pixel of the
+                           display)
+        :param horizontal: Vary the colour from left to right rather than
+                           from top to bottom
+        """
+        (x, y, w, h) = self._area(x, y, w, h)
+        if self._batch is not None:
+            self._batch.append([x, y, w, h, self.gradient,
+                                (start, end, x, y, w, h, horizontal)])
+            return
+
+        bufs = self._rows(x, y, w, h)
+        if not bufs:
+            return
+        display = self._display
+        quick_write = display.quick_write
+        colors = (start << 16) | end
+        buf = bufs[0]
+
+        display.quick_start()
+        if horizontal:
+            _ramp(buf, colors, w)
+            for i in range(h):
+                quick_write(buf)
+        else:
+            flip = 0
+            last = -1
+            for i in range(h):
+                c = _lerp565(colors, i, h - 1)
+                if c != last:
+                    flip ^= 1
+                    buf = bufs[flip]
+                    _fill(buf, c, w, 0)
+                    last = c
+                quick_write(buf)
+        display.quick_end()
+
     @micropython.native
-    def blit(self, image, x, y, fg=0xffff, c1=0x4a69, c2=0x7bef):
+    def pattern(self, tile, tw, x=0, y=0, w=None, h=None):
+        """Draw a rectangle filled with a repeating pattern.
+
+        The tile is repeated, starting from the top-left corner of the
+        rectangle. Each row is generated directly into the line buffer so
+        the pattern costs a single window and one write per row.
+
+        :param tile: Tile pixels (in RGB565 format), row by row, as an
+                     ``array.array('H')``
+        :param tw:   Width of the tile, in pixels (at most 255)
+        :param x:    X coordinate of the left-most pixels of the rectangle
+        :param y:    Y coordinate of the top-most pixels of the rectangle
+        :param w:    Width of the rectangle, defaults to None (which means
+                     select the right-most pixel of the display)
+        :param h:    Height of the rectangle, defaults to None (which means
+                     select the bottom-most pixel of the display)
+        """
+        (x, y, w, h) = self._area(x, y, w, h)
+        if self._batch is not None:
+            self._batch.append([x, y, w, h, self.pattern,
+                                (tile, tw, x, y, w, h)])
+            return
+
+        bufs = self._rows(x, y, w, h)
+        if not bufs:
+            return
+        display = self._display
+        quick_write = display.quick_write
+        th = len(tile) // tw
+        row = 0
+
+        display.quick_start()
+        for i in range(h):
+            if th > 1 or i == 0:
+                buf = bufs[i & 1]
+                _tile(buf, tile, ((row * tw) << 8) | tw, w)
+                row += 1
+                if row >= th:
+                    row = 0
+            quick_write(buf)
+        display.quick_end()
+
+    def _base(self):
+        """Get the display beneath any clipping or scrolling wrappers."""
+        display = self._display
+        while isinstance(display, (_Clip, _Scroll)):
+            display = display.display
+        return display
+
+    def _rebase(self, display):
+        """Replace the display beneath the clipping wrapper (if any)."""
+        if self._clips:
+            self._display.display = display
+        else:
+            self._display = display
+
+    def scroll(self, dy, redraw=None):
+        """Scroll the display using the display's hardware scrolling.
+
+        The contents of the scroll area (by default the whole display, see
+        :py:meth:`drivers.st7789.ST7789.set_scroll_area`) are moved up by
+        dy rows, or down if dy is negative, without being redrawn. redraw
+        is then called, with a clip rectangle covering just the newly
+        exposed rows, so that they can be filled in.
+
+        Drawing operations continue to use display coordinates after the
+        display has been scrolled and any strings remembered by
+        :py:meth:`~.update_string` are forgotten. Filling the whole display
+        restores the original scroll offset.
+
+        :param dy:     Number of rows to scroll up by
+        :param redraw: Function to draw the exposed rows, defaults to None
+                       (which means the exposed rows are not redrawn)
+        """
+        if self._batch:
+            self._replay()
+
+        display = self._base()
+        display.scroll(dy)
+        self._texts = {}
+        self._rebase(_Scroll(display) if display.scroll_offset else display)
+
+        if redraw and dy:
+            top = display.scroll_top
+            height = display.scroll_height
+            n = min(abs(dy), height)
+            self.push_clip(0, top + height - n if dy > 0 else top,
+                           display.width, n)
+            try:
+                redraw()
+            finally:
+                self.pop_clip()
+
+    def _unscroll(self):
+        """Restore the original scroll offset (without redrawing)."""
+        display = self._base()
+        display.scroll(-display.scroll_offset)
+        self._rebase(display)
+
+    def push_clip(self, x, y, w, h):
+        """Restrict drawing to a rectangle.
+
+        All drawing operations are clipped to the rectangle until the
+        matching :py:meth:`~.pop_clip`. Clip rectangles can be nested, in
+        which case drawing is restricted to the intersection of all the
+        rectangles on the stack. This makes it possible to repaint just the
+        damaged region of the display:
+
+        .. code-block:: python
+
+            draw = wasp.watch.drawable
+            draw.push_clip(0, 200, 240, 40)
+            self._draw()
+            draw.pop_clip()
+
+        :param x: X coordinate of the left-most pixels of the rectangle
+        :param y: Y coordinate of the top-most pixels of the rectangle
+        :param w: Width of the rectangle
+        :param h: Height of the rectangle
+        """
+        if self._batch:
+            self._replay()
+
+        clips = self._clips
+        if clips:
+            clip = _intersect(clips[-1], x, y, w, h)
+            self._display.clip = clip
+        else:
+            clip = (x, y, w, h)
+            self._display = _Clip(self._display, clip)
+        clips.append(clip)
+
+    def pop_clip(self):
+        """Remove the clip rectangle added by the last
+        :py:meth:`~.push_clip`."""
+        if self._batch:
+            self._replay()
+
+        clips = self._clips
+        clips.pop()
+        if clips:
+            self._display.clip = clips[-1]
+        else:
+            self._display = self._display.display
+
+    def begin(self):
+        """Start recording drawing operations into a display list.
+
+        Whilst recording, :py:meth:`~.fill`, :py:meth:`~.blit` and
+        :py:meth:`~.string` are not drawn immediately. Instead they are
+        stored until :py:meth:`~.commit` is called. Other drawing operations
+        still work but they cause the operations recorded so far to be
+        drawn immediately (to preserve the drawing order).
+
+        .. code-block:: python
+
+            draw = wasp.watch.drawable
+            draw.begin()
+            draw.fill(0, 0, 0, 120, 40)
+            draw.fill(0, 120, 0, 120, 40)
+            draw.string('Hello', 0, 8, width=240)
+            eliminated = draw.commit()
+
+        Calls to begin() and commit() may be nested, in which case nothing is
+        drawn until the outermost commit().
+        """
+        self._depth += 1
+        if self._batch is None:
+            self._batch = []
+            self._eliminated = 0
+
+    def commit(self):
+        """Draw the operations recorded since :py:meth:`~.begin`.
+
+        The display list is optimized before it is drawn. Operations that
+        would be completely overdrawn are dropped and fills of the same
+        colour are merged whenever the result is still a rectangle.
+
+        :returns: The number of operations that were eliminated
+        """
+        if self._batch is None:
+            return 0
+        self._depth -= 1
+        if self._depth > 0:
+            return 0
+        self._replay()
+        self._batch = None
+        return self._eliminated
+
+    def _replay(self):
+        """Optimize and draw the display list (without leaving batch mode)."""
+        ops = self._batch
+        self._batch = None
+        try:
+            optimized = _optimize(ops)
+            self._eliminated += len(ops) - len(optimized)
+            for (x, y, w, h, method, args) in optimized:
+                if method:
+                    method(*args)
+                else:
+                    self.fill(args, x, y, w, h)
+        finally:
+            self._batch = []
+
+    def blit(self, image, x, y, fg=0xffff, c1=0x4a69, c2=0x7bef, scale=1):
         """Decode and draw an encoded image.
 
-        :param image: Image data in either 1-bit RLE or 2-bit RLE formats. The
-                      format will be autodetected
+        :param image: Image data in 1-bit RLE, 2-bit RLE or 8-bit RLE formats.
+                      The format will be autodetected
         :param x: X coordinate for the left-most pixels in the image
         :param y: Y coordinate for the top-most pixels in the image
+        :param scale: Integer scale factor. Each pixel of the image is drawn
+                      as a scale x scale block, allowing large images to be
+                      stored at reduced size. The scaled width of the image
+                      must fit in the display's line buffer.
+
+        8-bit RLE images contain their own colours so ``fg``, ``c1`` and
+        ``c2`` are ignored.
         """
+        if self._batch is not None or self._clips:
+            (w, h) = image[0:2] if len(image) == 3 else image[1:3]
+            if self._batch is not None:
+                self._batch.append([x, y, w * scale, h * scale, self.blit,
+                                    (image, x, y, fg, c1, c2, scale)])
+                return
+            if not _intersect(self._clips[-1], x, y, w * scale, h * scale)[2]:
+                return
+
         if len(image) == 3:
             # Legacy 1-bit image
-            self.rleblit(image, (x, y), fg)
+            self.rleblit(image, (x, y), fg, 0, scale)
+        elif image[0] == 8:
+            # 8-bit RLE image, (255x255, v1)
+            self._rle8bit(image, x, y, scale)
         else: #elif image[0] == 2:
             # 2-bit RLE image, (255x255, v1)
-            self._rle2bit(image, x, y, fg, c1, c2)
+            cache = self.image_cache if scale == 1 else None
+            spans = cache.get(image, fg, c1, c2) if cache else None
+            if spans:
+                _blit_spans(self._display, spans, x, y, image[1], image[2])
+            else:
+                self._rle2bit(image, x, y, fg, c1, c2, scale)
+
+    def blit_file(self, fname, x, y, fg=0xffff, c1=0x4a69, c2=0x7bef):
+        """Stream an encoded image from the filesystem to the display.
+
+        The image is read a chunk at a time, into a small preallocated
+        buffer, so that large images can be drawn without having to load
+        the whole file into RAM.
+
+        :param fname: Name of the image file. 2-bit RLE and 8-bit RLE files
+                      contain exactly the same data as the images passed to
+                      :py:meth:`~.blit`. Uncompressed images have a three
+                      byte header (16, width, height) followed by the pixels
+                      in big-endian RGB565 format. Image files can be
+                      generated using ``tools/rle_encode.py --binary``
+        :param x: X coordinate for the left-most pixels in the image
+        :param y: Y coordinate for the top-most pixels in the image
+        """
+        if self._batch:
+            self._replay()
+
+        with open(fname, 'rb') as f:
+            hdr = f.read(3)
+            if len(hdr) != 3 or hdr[0] not in (2, 8, 16):
+                raise ValueError('unsupported image format')
+            if self._clips and \
+                    not _intersect(self._clips[-1], x, y, hdr[1], hdr[2])[2]:
+                return
+
+            if hdr[0] == 16:
+                self._raw16bit(f, x, y, hdr[1], hdr[2])
+            elif hdr[0] == 8:
+                self._rle8bit(hdr, x, y, f=f)
+            else:
+                self._rle2bit(hdr, x, y, fg, c1, c2, f=f)
+
+    def _raw16bit(self, f, x, y, sx, sy):
+        """Stream an uncompressed RGB565 image from a file.
+
+        The pixels are already in the byte order expected by the display
+        so they are read straight into the line buffer.
+        """
+        display = self._display
+        quick_write = display.quick_write
+        bufs = display.linebuffers
+        flip = 0
+        remaining = 2 * sx * sy
+
+        display.set_window(x, y, sx, sy)
+        display.quick_start()
+        while remaining:
+            buf = bufs[flip]
+            n = f.readinto(buf if remaining >= len(buf) else buf[0:remaining])
+            if not n:
+                break
+            quick_write(buf if n == len(buf) else buf[0:n])
+            flip ^= 1
+            remaining -= n
+        display.quick_end()
+
+    def _scaled(self, sx, scale):
+        """Check that a scaled image fits in the line buffer."""
+        if scale > 1 and sx * scale > len(self._display.linebuffer) // 2:
+            raise ValueError('image is too wide to scale')
 
     @micropython.native
-    def rleblit(self, image, pos=(0, 0), fg=0xffff, bg=0):
+    def rleblit(self, image, pos=(0, 0), fg=0xffff, bg=0, scale=1):
         """Decode and draw a 1-bit RLE image.
 
         .. deprecated:: M2
             Use :py:meth:`~.blit` instead.
         """
+        if self._batch:
+            self._replay()
+
         display = self._display
         write_data = display.write_data
         (sx, sy, rle) = image
+        self._scaled(sx, scale)
 
-        display.set_window(pos[0], pos[1], sx, sy)
+        display.set_window(pos[0], pos[1], sx * scale, sy * scale)
 
-        buf = display.linebuffer[0:2*sx]
+        buf = display.linebuffer[0:2*sx*scale]
         bp = 0
         color = bg
 
         for rl in rle:
             while rl:
                 count = min(sx - bp, rl)
-                _fill(buf, color, count, bp)
+                _fill(buf, color, count * scale, bp * scale)
                 bp += count
                 rl -= count
 
                 if bp >= sx:
-                    write_data(buf)
+                    for i in range(scale):
+                        write_data(buf)
                     bp = 0
 
             if color == bg:
@@ -219,58 +1719,138 @@ class Draw565(object):
                 color = bg
 
     @micropython.native
-    def _rle2bit(self, image, x, y, fg, c1, c2):
-        """Decode and draw a 2-bit RLE image."""
+    def _rle2bit(self, image, x, y, fg, c1, c2, scale=1, f=None):
+        """Decode and draw a 2-bit RLE image.
+
+        Scaled images are drawn by replicating each run horizontally and
+        then sending each decoded row scale times.
+
+        If f is provided then image contains only the header and the
+        rest of the image is read from f a chunk at a time. The decoder
+        state is kept in local variables so runs may span chunks.
+        """
         display = self._display
         quick_write = display.quick_write
         sx = image[1]
         sy = image[2]
-        rle = memoryview(image)[3:]
+        if f:
+            chunk = memoryview(_file_chunk())
+            rle = chunk[0:f.readinto(chunk)]
+        else:
+            rle = memoryview(image)[3:]
+        self._scaled(sx, scale)
 
-        display.set_window(x, y, sx, sy)
+        display.set_window(x, y, sx * scale, sy * scale)
 
-        if sx <= (len(display.linebuffer) // 4) and not bool(sy & 1):
-            sx *= 2
-            sy //= 2
+        # Unscaled images are decoded as many rows at a time as will fit
+        # in the line buffer (the last write may be shorter)
+        if scale == 1:
+            sx *= max(1, min(sy, len(display.linebuffer) // (2 * sx)))
 
         palette = array.array('H', (0, c1, c2, fg))
         next_color = 1
         rl = 0
-        buf = display.linebuffer[0:2*sx]
+        bufs = _buffers(display, 2*sx*scale)
+        flip = 0
+        buf = bufs[0]
         bp = 0
 
         display.quick_start()
-        for op in rle:
-            if rl == 0:
-                px = op >> 6
-                rl = op & 0x3f
-                if 0 == rl:
-                    rl = -1
-                    continue
-                if rl >= 63:
-                    continue
-            elif rl > 0:
-                rl += op
-                if op >= 255:
-                    continue
-            else:
-                palette[next_color] = _clut8_rgb565(op)
-                if next_color < 3:
-                    next_color += 1
+        while rle:
+            for op in rle:
+                if rl == 0:
+                    px = op >> 6
+                    rl = op & 0x3f
+                    if 0 == rl:
+                        rl = -1
+                        continue
+                    if rl >= 63:
+                        continue
+                elif rl > 0:
+                    rl += op
+                    if op >= 255:
+                        continue
                 else:
-                    next_color = 1
-                rl = 0
-                continue
+                    palette[next_color] = _clut8_rgb565(op)
+                    if next_color < 3:
+                        next_color += 1
+                    else:
+                        next_color = 1
+                    rl = 0
+                    continue
 
-            while rl:
-                count = min(sx - bp, rl)
-                _fill(buf, palette[px], count, bp)
-                bp += count
-                rl -= count
+                while rl:
+                    count = min(sx - bp, rl)
+                    _fill(buf, palette[px], count * scale, bp * scale)
+                    bp += count
+                    rl -= count
+
+                    if bp >= sx:
+                        for i in range(scale):
+                            quick_write(buf)
+                        flip ^= 1
+                        buf = bufs[flip]
+                        bp = 0
+            rle = chunk[0:f.readinto(chunk)] if f else None
+        if bp:
+            quick_write(buf[0:2*bp])
+        display.quick_end()
 
-                if bp >= sx:
-                    quick_write(buf)
-                    bp = 0
+    @micropython.native
+    def _rle8bit(self, image, x, y, scale=1, f=None):
+        """Decode and draw an 8-bit RLE image.
+
+        Scaled images are decoded one row at a time. Each row is stretched
+        in place and then sent scale times.
+
+        If f is provided then image contains only the header and the
+        rest of the (unscaled) image is read from f a chunk at a time.
+        """
+        display = self._display
+        quick_write = display.quick_write
+        sx = image[1]
+        sy = image[2]
+        rle = _file_chunk() if f else memoryview(image)[3:]
+        more = bool(f)
+        self._scaled(sx, scale)
+
+        display.set_window(x, y, sx * scale, sy * scale)
+
+        bufs = display.linebuffers
+        flip = 0
+        sz = len(bufs[0]) // 2
+        n = 0 if f else len(rle)
+        state = array.array('I', (0, n, 0, 0, 0, n))
+        clut = _clut8_swapped()
+        remaining = sx * sy
+
+        display.quick_start()
+        if scale > 1:
+            rows = _buffers(display, 2*sx*scale)
+            state[4] = sx
+            for i in range(sy):
+                buf = bufs[flip]
+                if not _decode8bit(buf, rle, state, clut):
+                    break
+                _stretch(buf, sx, scale)
+                for j in range(scale):
+                    quick_write(rows[flip])
+                flip ^= 1
+            display.quick_end()
+            return
+
+        while remaining:
+            if more and state[0] >= state[1]:
+                more = _refill(f, rle, state)
+            state[4] = min(sz, remaining)
+            buf = bufs[flip]
+            count = _decode8bit(buf, rle, state, clut)
+            if count:
+                quick_write(buf if count == sz else buf[0:2*count])
+                flip ^= 1
+                remaining -= count
+            elif not more:
+                break
         display.quick_end()
 
     def set_color(self, color, bg=0):
@@ -285,13 +1865,74 @@ class Draw565(object):
         """
         self._bgfg = (bg << 16) + color
 
+    def set_glyph_cache(self, budget):
+        """Enable (or disable) the glyph cache.
+
+        When enabled :py:meth:`~.string` will keep recently used glyphs
+        pre-rendered so they can be sent to the display with a single write.
+        The cache statistics can be found in :py:attr:`glyph_cache`.
+
+        :param int budget: Size of the cache in bytes, or 0 to disable it
+        """
+        self.glyph_cache = GlyphCache(budget) if budget else None
+
+    def set_image_cache(self, budget):
+        """Enable (or disable) the image cache.
+
+        When enabled :py:meth:`~.blit` will keep recently used 2-bit RLE
+        images pre-decoded so they can be redrawn without parsing the RLE
+        stream. The cache statistics, including the memory in use, can be
+        found in :py:attr:`image_cache`.
+
+        :param int budget: Size of the cache in bytes, or 0 to disable it
+        """
+        self.image_cache = ImageCache(budget) if budget else None
+
+    def drop_caches(self):
+        """Release any memory held by the drawing caches.
+
+        This is used by the system manager when memory is running low. The
+        caches remain enabled and will refill as drawing continues.
+        """
+        if self.glyph_cache:
+            self.glyph_cache.clear()
+        if self.image_cache:
+            self.image_cache.clear()
+        self._blends = {}
+
+        global _clut8
+        _clut8 = None
+
     def set_font(self, font):
         """Set the font used for rendering text.
 
-        :param font:  A font module generated using ``font_to_py.py``.
+        :param font:  A font module generated using ``font_to_py.py`` or,
+                      for anti-aliased text, ``tools/aafont.py``.
         """
         self._font = font
 
+    def _blend(self, font, bgfg):
+        """Get the blend table needed to draw an anti-aliased font.
+
+        Blend tables are cached, for the handful of colour combinations an
+        application typically uses, so they need only be calculated once.
+
+        :returns: (blend table, bits per pixel) or None for 1-bit fonts
+        """
+        bpp = fonts.bpp(font)
+        if bpp == 1:
+            return None
+
+        key = (bgfg, bpp)
+        blends = self._blends
+        aa = blends.get(key)
+        if not aa:
+            if len(blends) >= 8:
+                blends.clear()
+            aa = (_blend_table(bgfg, bpp), bpp)
+            blends[key] = aa
+        return aa
+
     def string(self, s, x, y, width=None, right=False):
         """Draw a string at the supplied position.
 
@@ -306,31 +1947,149 @@ class Draw565(object):
                       need to "undraw" it)
         :param right: If True (and width is set) then right justify rather than
                       centre the text
+
+        If :py:attr:`strip_text` is True (the default) and the line, including
+        any padding, fits within the display's line buffer then the whole line
+        is drawn through a single display window, sending as many pixel rows
+        at a time as the line buffer can hold.
         """
         display = self._display
         bgfg = self._bgfg
         font = self._font
         bg = self._bgfg >> 16
 
+        texts = self._texts
+        if texts and (x, y) in texts:
+            texts[(x, y)] = (s, font, bgfg, width, right)
+
+        (w, h) = _bounding_box(s, font)
         if width:
-            (w, h) = _bounding_box(s, font)
             if right:
                 leftpad = width - w
-                rightpad = 0
             else:
                 leftpad = (width - w) // 2
-                rightpad = width - w - leftpad
+            rightpad = width - w - leftpad
+        else:
+            leftpad = 0
+            rightpad = 0
+
+        if self._batch is not None:
+            self._batch.append([x + min(leftpad, 0), y,
+                                max(leftpad, 0) + w + max(rightpad, 0), h,
+                                self._string,
+                                (s, x, y, width, right, font, bgfg)])
+            return
+
+        aa = self._blend(font, bgfg)
+        if self.strip_text and leftpad >= 0 and rightpad >= 0 and \
+                0 < leftpad + w + rightpad <= len(display.linebuffer) // 2:
+            _draw_strip(display, font, s, x, y, leftpad + w + rightpad,
+                        leftpad, bgfg, aa, self.glyph_cache)
+            return
+
+        if width:
             self.fill(bg, x, y, leftpad, h)
             x += leftpad
 
+        cache = self.glyph_cache
         for ch in s:
+            glyph = cache.get(font, ch, bgfg, aa) if cache else None
+            if glyph:
+                display.set_window(x, y, glyph[1], glyph[2])
+                display.write_data(glyph[0])
+                x += glyph[1]
+                continue
+
             glyph = font.get_ch(ch)
-            _draw_glyph(display, glyph, x, y, bgfg)
+            _draw_glyph(display, glyph, x, y, bgfg, aa)
             x += glyph[2] + 1
 
         if width:
             self.fill(bg, x, y, rightpad, h)
 
+    def _string(self, s, x, y, width, right, font, bgfg):
+        """Draw a recorded string using the font and colours it was
+        recorded with."""
+        saved = (self._font, self._bgfg)
+        self._font = font
+        self._bgfg = bgfg
+        self.string(s, x, y, width, right)
+        (self._font, self._bgfg) = saved
+
+    def update_string(self, s, x, y, width=None, right=False):
+        """Update a string, redrawing only the glyphs that have changed.
+
+        The string drawn at each position is remembered. When the position
+        is next updated the new string is compared to the old one and only
+        the glyphs that differ are redrawn. This makes it very cheap to
+        update counters and clocks where only a single digit changes.
+
+        A full redraw is used instead if the font, colours or layout have
+        changed or if any of the changed glyphs has a different width
+        (since that would shift every glyph to its right).
+
+        Remembered strings are forgotten by :py:meth:`~.reset` and when the
+        whole display is filled. Drawing over an updated string by any
+        other means requires the caller to redraw it using
+        :py:meth:`~.string`, which also updates the remembered copy.
+
+        :param s:     String to render
+        :param x:     X coordinate for the left-most pixels in the image
+        :param y:     Y coordinate for the top-most pixels in the image
+        :param width: Width to centre the string within, see
+                      :py:meth:`~.string`
+        :param right: If True (and width is set) then right justify rather than
+                      centre the text
+        """
+        font = self._font
+        key = (x, y)
+        texts = self._texts
+        prev = texts.get(key)
+        state = (s, font, self._bgfg, width, right)
+
+        if not prev or prev[1:] != state[1:] or len(prev[0]) != len(s):
+            texts[key] = state
+            self.string(s, x, y, width, right)
+            return
+        old = prev[0]
+        if old == s:
+            return
+
+        if width:
+            w = _bounding_box(s, font)[0]
+            x += width - w if right else (width - w) // 2
+
+        # Find the runs of glyphs that have changed (all glyphs to the left
+        # of a change must have the same width as before)
+        widths = fonts.widths(font)
+        runs = []
+        start = -1
+        for i in range(len(s)):
+            ch = s[i]
+            oc = ord(ch)
+            wc = (widths[oc - 31] if 32 <= oc <= 126 else
+                  fonts.advance(font, widths, ch)) + 1
+            if ch != old[i]:
+                ch = old[i]
+                oc = ord(ch)
+                if wc != (widths[oc - 31] if 32 <= oc <= 126 else
+                          fonts.advance(font, widths, ch)) + 1:
+                    self.string(s, key[0], y, width, right)
+                    return
+                if start < 0:
+                    start = i
+                    rx = x
+            elif start >= 0:
+                runs.append((start, i, rx))
+                start = -1
+            x += wc
+        if start >= 0:
+            runs.append((start, len(s), rx))
+
+        for (i, j, rx) in runs:
+            self.string(s[i:j], rx, y)
+        texts[key] = state
+
     def bounding_box(self, s):
         """Return the bounding box of a string.
 
@@ -358,10 +2117,41 @@ class Draw565(object):
         :param width: Width to wrap the text into
         :returns:     List of chunk boundaries
         """
+        chunks = [ 0, ]
+        for end in self.iwrap(s, width):
+            chunks.append(end)
+
+        return chunks
+
+    def iwrap(self, s, width, start=0):
+        """Lazily chunk a string so it can rendered within a specified width.
+
+        This is a generator version of :py:meth:`~.wrap` that yields the end
+        of each line as it is found. It allows the first few lines of a long
+        string to be rendered without wrapping the whole string. Wrapping can
+        also be resumed from any line boundary that was previously yielded,
+        allowing a pager to remember where each page starts.
+
+        Example:
+
+        .. code-block:: python
+
+            draw = wasp.watch.drawable
+            start = 0
+            for end in draw.iwrap(long_string, 240):
+                print(long_string[start:end])
+                start = end
+
+        :param s:     String to be chunked
+        :param width: Width to wrap the text into
+        :param start: Offset to start wrapping from, this must be the start
+                      of a line
+        :returns:     Generator of chunk boundaries
+        """
         font = self._font
+        widths = fonts.widths(font)
         max = len(s)
-        chunks = [ 0, ]
-        end = 0
+        end = start
 
         while end < max:
             start = end
@@ -372,8 +2162,9 @@ class Draw565(object):
                     end = i
                     break
                 ch = s[i]
-                (_, h, w) = font.get_ch(ch)
-                l += w + 1
+                oc = ord(ch)
+                l += (widths[oc - 31] if 32 <= oc <= 126 else
+                      fonts.advance(font, widths, ch)) + 1
                 if l > width:
                     if end <= start:
                         end = i
@@ -387,9 +2178,7 @@ class Draw565(object):
                 # Remember the right-most place we can cleanly break the line
                 if ch == ' ':
                     end = i+1
-            chunks.append(end)
-
-        return chunks
+            yield end
 
     def line(self, x0, y0, x1, y1, width=1, color=None):
         """Draw a line between points (x0, y0) and (x1, y1).
@@ -407,12 +2196,13 @@ class Draw565(object):
         :param y1: Y coordinate of the end of the line
         :param width: Width of the line in pixels
         :param color: Colour to draw line, defaults to the foreground colour
+
+        Lines are drawn as a series of horizontal (or vertical) runs and each
+        run is sent to the display using a single window. Thick diagonal lines
+        are scan converted as a polygon, one window per pixel row.
         """
         if color is None:
             color = self._bgfg & 0xffff
-        px = bytes(((color >> 8) & 0xFF, color & 0xFF)) * (width * width)
-        write_data = self._display.write_data
-        set_window = self._display.set_window
 
         dw = (width - 1) // 2
         x0 -= dw
@@ -420,32 +2210,49 @@ class Draw565(object):
         x1 -= dw
         y1 -= dw
 
-        dx =  abs(x1 - x0)
-        sx = 1 if x0 < x1 else -1
-        dy = -abs(y1 - y0)
-        sy = 1 if y0 < y1 else -1
-        err = dx + dy
+        dx = abs(x1 - x0)
+        dy = abs(y1 - y0)
         if dx == 0 or dy == 0:
             if x1 < x0 or y1 < y0:
                 x0, x1 = x1, x0
                 y0, y1 = y1, y0
             w = width if dx == 0 else (dx + width)
-            h = width if dy == 0 else (-dy + width)
+            h = width if dy == 0 else (dy + width)
             self.fill(color, x0, y0, w, h)
             return
-        while True:
-            set_window(x0, y0, width, width)
-            write_data(px)
-            if x0 == x1 and y0 == y1:
-                break
-            e2 = 2 * err
-            if e2 >= dy:
-                err += dy
-                x0 += sx
-            if e2 <= dx:
-                err += dx;
-                y0 += sy;
-        
+
+        display = self._display
+        buf = self._solid(color)
+
+        if width > 1:
+            # Find the corners of a rectangle, centred on the line, that
+            # extends by half the width beyond each end point (matching the
+            # square ends drawn for horizontal and vertical lines). All
+            # values are in 1/16ths of a pixel.
+            length = _isqrt(256 * (dx*dx + dy*dy))
+            ux = ((x1 - x0) * 128 * width + length // 2) // length
+            uy = ((y1 - y0) * 128 * width + length // 2) // length
+            offset = 8 * width
+            ax = 16 * x0 + offset - ux
+            ay = 16 * y0 + offset - uy
+            bx = 16 * x1 + offset + ux
+            by = 16 * y1 + offset + uy
+
+            quad = self._quad
+            quad[0] = ax - uy
+            quad[1] = ay + ux
+            quad[2] = bx - uy
+            quad[3] = by + ux
+            quad[4] = bx + uy
+            quad[5] = by - ux
+            quad[6] = ax + uy
+            quad[7] = ay - ux
+            _polygon(display, buf, quad)
+        elif dx >= dy:
+            _hline(display, buf, x0, y0, x1, y1)
+        else:
+            _vline(display, buf, x0, y0, x1, y1)
+
     def polar(self, x, y, theta, r0, r1, width=1, color=None):
         """Draw a line using polar coordinates.
 
@@ -454,32 +2261,123 @@ class Draw565(object):
         Specifically the reference direction is drawn vertically
         upwards and the angle is measures clockwise in degrees.
 
+        The end points are calculated using the integer lookup tables in
+        :py:mod:`trig` so angles are rounded to the nearest whole degree.
+
         Example:
 
         .. code-block:: python
 
             draw = wasp.watch.drawable
-            draw.line(360 / 12, 16, 64)
+            draw.polar(120, 120, 360 // 12, 16, 64)
 
         :param x: X coordinate of the origin
         :param y: Y coordinate of the origin
         :param theta: Angle, in degrees
         :param r0: Radius of the start of the line
-        :param y0: Radius of the end of the line
+        :param r1: Radius of the end of the line
         :param width: Width of the line in pixels
         :param color: Colour to draw line in, defaults to the foreground colour
         """
-        to_radians = math.pi / 180
-        xdelta = math.sin(theta * to_radians)
-        ydelta = math.cos(theta * to_radians)
+        if not isinstance(theta, int):
+            theta = int(theta + 0.5)
 
-        x0 = x + int(xdelta * r0)
-        x1 = x + int(xdelta * r1)
-        y0 = y - int(ydelta * r0)
-        y1 = y - int(ydelta * r1)
+        x0 = trig.polar_x(x, theta, r0)
+        x1 = trig.polar_x(x, theta, r1)
+        y0 = trig.polar_y(y, theta, r0)
+        y1 = trig.polar_y(y, theta, r1)
 
         self.line(x0, y0, x1, y1, width, color)
 
+    def _solid(self, color):
+        """Get the line buffer, filled with color (or the foreground)."""
+        if self._batch:
+            self._replay()
+        if color is None:
+            color = self._bgfg & 0xffff
+        buf = self._display.linebuffer
+        _fill(buf, color, len(buf) // 2, 0)
+        return buf
+
+    def circle(self, x, y, r, color=None):
+        """Draw a filled circle.
+
+        Example:
+
+        .. code-block:: python
+
+            draw = wasp.watch.drawable
+            draw.circle(120, 120, 40, 0xf800)
+
+        :param x: X coordinate of the centre of the circle
+        :param y: Y coordinate of the centre of the circle
+        :param r: Radius of the circle, in pixels
+        :param color: Colour to draw circle in, defaults to the foreground
+                      colour
+
+        The circle is drawn as a series of horizontal runs with a single
+        window for each row.
+        """
+        _ring(self._display, self._solid(color), x, y, 0, r, None)
+
+    def ring(self, x, y, r0, r1, start=0, end=360, color=None):
+        """Draw a filled ring, or part of a ring.
+
+        The angles use the same conventions as :py:meth:`~.polar`: zero
+        is vertically upwards and the arc is drawn clockwise from start to
+        end. This makes it simple to draw progress gauges:
+
+        .. code-block:: python
+
+            draw = wasp.watch.drawable
+            draw.ring(120, 120, 90, 100, 0, 360 * steps // goal, 0x07e0)
+
+        :param x: X coordinate of the centre of the ring
+        :param y: Y coordinate of the centre of the ring
+        :param r0: Inner radius of the ring, pass 0 to draw a sector
+        :param r1: Outer radius of the ring
+        :param start: Angle, in whole degrees, of the start of the arc
+        :param end: Angle, in whole degrees, of the end of the arc
+        :param color: Colour to draw ring in, defaults to the foreground
+                      colour
+        """
+        if end - start >= 360:
+            sector = None
+        else:
+            sweep = (end - start) % 360
+            if not sweep:
+                return
+
+            sector = (trig.isin(start), -trig.icos(start),
+                      trig.isin(end), -trig.icos(end), sweep > 180)
+
+        _ring(self._display, self._solid(color), x, y, r0, r1, sector)
+
+    def polygon(self, points, color=None):
+        """Draw a filled convex polygon.
+
+        Example:
+
+        .. code-block:: python
+
+            draw = wasp.watch.drawable
+            draw.polygon(((120, 40), (140, 120), (100, 120)), 0xffe0)
+
+        Points lie on the corners of the pixels, much like the rectangles
+        passed to :py:meth:`~.fill`, and a pixel is drawn if its centre lies
+        within the polygon. Concave polygons are not supported (they will be
+        drawn as if the concave areas were filled).
+
+        :param points: Sequence of (x, y) vertices, in order
+        :param color: Colour to draw polygon in, defaults to the foreground
+                      colour
+        """
+        pts = []
+        for (x, y) in points:
+            pts.append(16 * x)
+            pts.append(16 * y)
+        _polygon(self._display, self._solid(color), pts)
+
     def lighten(self, color, step=1):
         """Get a lighter shade from the same palette.
 
@@ -503,6 +2401,21 @@ class Draw565(object):
 
         return (r | g | b)
 
+    def shades(self, color, steps):
+        """Get a table of lighter and darker shades of a colour.
+
+        :param color: Colour to shade
+        :param steps: Number of lighter (and darker) shades to calculate
+        :returns:     Array of 2 * steps + 1 colours, the original colour is
+                      at index steps with darker shades before it and lighter
+                      shades after
+        """
+        table = array.array('H', [color] * (2*steps + 1))
+        for i in range(1, steps+1):
+            table[steps - i] = self.darken(color, i)
+            table[steps + i] = self.lighten(color, i)
+        return table
+
     def darken(self, color, step=1):
         """Get a darker shade from the same palette.
 
@@ -524,3 +2437,184 @@ class Draw565(object):
         b = bm - step if bm > step else 0
 
         return (r | g | b)
+
+class _Surface(object):
+    """Display-like wrapper around an off-screen RGB565 buffer.
+
+    The surface implements just enough of the display driver interface
+    (windows and data writes) for the Draw565 rendering code to draw into
+    memory. Writes are wrapped at the edges of the window, just like the
+    display, and any pixels that fall outside the surface are discarded.
+    """
+
+    def __init__(self, buf, width, height, linebuffer):
+        self.buf = memoryview(buf)
+        self.width = width
+        self.height = height
+        self.linebuffer = linebuffer
+        self.linebuffers = (linebuffer, linebuffer)
+        self.set_window(0, 0, width, height)
+
+    def set_window(self, x, y, width, height):
+        self._window = (x, y, width, height)
+        self._col = 0
+        self._row = 0
+
+    def quick_start(self):
+        pass
+
+    def quick_end(self):
+        pass
+
+    @micropython.native
+    def quick_write(self, data):
+        (x, y, w, h) = self._window
+        stride = self.width
+        buf = self.buf
+        col = self._col
+        row = self._row
+        sz = len(data) // 2
+        i = 0
+
+        while i < sz:
+            count = min(w - col, sz - i)
+
+            # Clip the run to the edges of the surface
+            left = x + col
+            right = left + count
+            skip = 0
+            if left < 0:
+                skip = -left
+                left = 0
+            if right > stride:
+                right = stride
+            ry = y + row
+            if right > left and 0 <= ry < self.height:
+                d = 2 * (ry * stride + left)
+                s = 2 * (i + skip)
+                buf[d:d + 2*(right-left)] = data[s:s + 2*(right-left)]
+
+            i += count
+            col += count
+            if col >= w:
+                col = 0
+                row += 1
+                if row >= h:
+                    row = 0
+
+        self._col = col
+        self._row = row
+
+    def write_data(self, data):
+        self.quick_write(data)
+
+class Canvas(Draw565):
+    """Off-screen RGB565 canvas.
+
+    A canvas supports the same drawing operations as :py:class:`.Draw565`
+    but draws into a buffer in RAM rather than directly to the display.
+    This allows overlapping drawing operations (such as a background, an
+    icon and some text) to be composed without flicker and then sent to the
+    display using a single window:
+
+    .. code-block:: python
+
+        canvas = draw565.Canvas(wasp.watch.display, 80, 40)
+        canvas.fill(0x001f)
+        canvas.string('OK', 0, 8, width=80)
+        canvas.flush(80, 100)
+
+    Coordinates passed to the drawing operations are relative to the top
+    left corner of the canvas.
+
+    .. automethod:: __init__
+    """
+
+    def __init__(self, display, width, height, buf=None):
+        """Create a canvas.
+
+        The canvas borrows the line buffer of the display so the canvas
+        requires only 2 bytes of RAM per pixel.
+
+        :param display: Display the canvas will be flushed to
+        :param width:   Width of the canvas, in pixels
+        :param height:  Height of the canvas, in pixels
+        :param buf:     Buffer of at least 2 * width * height bytes to draw
+                        into, a new buffer is allocated if this is omitted
+        """
+        if buf is None:
+            buf = bytearray(2 * width * height)
+        elif len(buf) < 2 * width * height:
+            raise ValueError('canvas buffer is too small')
+
+        self._target = display
+        self._surface = _Surface(buf, width, height, display.linebuffer)
+        super().__init__(self._surface)
+
+    @property
+    def buffer(self):
+        """Memory view of the pixels of the canvas (in display byte order)."""
+        surface = self._surface
+        return surface.buf[0:2 * surface.width * surface.height]
+
+    def fill(self, bg=None, x=0, y=0, w=None, h=None):
+        """Draw a solid colour rectangle.
+
+        Identical to :py:meth:`.Draw565.fill` except that the rectangle is
+        clipped to the edges of the canvas.
+        """
+        if self._batch is not None:
+            super().fill(bg, x, y, w, h)
+            return
+
+        surface = self._surface
+        if bg is None:
+            bg = self._bgfg >> 16
+        if w is None:
+            w = surface.width - x
+        if h is None:
+            h = surface.height - y
+
+        if w == surface.width and h == surface.height and not self._clips:
+            self._texts = {}
+
+        if self._clips:
+            (x, y, w, h) = _intersect(self._clips[-1], x, y, w, h)
+        x1 = min(x + w, surface.width)
+        y1 = min(y + h, surface.height)
+        x = max(x, 0)
+        y = max(y, 0)
+        if x1 <= x:
+            return
+
+        buf = surface.buf
+        stride = surface.width
+        for row in range(y, y1):
+            _fill(buf, bg, x1 - x, row * stride + x)
+
+    def flush(self, x, y, draw=None):
+        """Send the contents of the canvas to the display.
+
+        :param x:    X coordinate of the left-most pixels of the canvas
+        :param y:    Y coordinate of the top-most pixels of the canvas
+        :param draw: Drawable to send the canvas through, defaults to None
+                     (which means send it straight to the display). The
+                     clip rectangle of draw is respected and any operations
+                     it has batched are drawn first.
+        """
+        surface = self._surface
+        w = surface.width
+        h = surface.height
+        if not draw:
+            self._target.rawblit(self.buffer, x, y, w, h)
+            return
+
+        # The canvas may be reused as soon as we return so it cannot be
+        # added to the batch
+        if draw._batch:
+            draw._replay()
+        if draw._clips and not _intersect(draw._clips[-1], x, y, w, h)[2]:
+            return
+        display = draw._display
+        display.set_window(x, y, w, h)
+        display.write_data(self.buffer)
@@ -20,6 +20,7 @@ from time import sleep_ms
 _SWRESET            = const(0x01)
 _SLPIN              = const(0x10)
 _SLPOUT             = const(0x11)
+_PTLON              = const(0x12)
 _NORON              = const(0x13)
 _INVOFF             = const(0x20)
 _INVON              = const(0x21)
@@ -28,23 +29,81 @@ _DISPON             = const(0x29)
 _CASET              = const(0x2a)
 _RASET              = const(0x2b)
 _RAMWR              = const(0x2c)
-_COLMOD             = const(0x3a)
+_PTLAR              = const(0x30)
+_VSCRDEF            = const(0x33)
 _MADCTL             = const(0x36)
+_VSCSAD             = const(0x37)
+_IDMOFF             = const(0x38)
+_IDMON              = const(0x39)
+_COLMOD             = const(0x3a)
+
+# The frame memory has more rows than the panel (the rest are never shown)
+_FRAME_ROWS         = const(320)
+
+@micropython.viper
+def _fill(mv, color: int, count: int):
+    """Fill the start of a buffer with count pixels of the same colour."""
+    p = ptr16(mv)
+    color = (color >> 8) + ((color & 0xff) << 8)
+
+    for x in range(count):
+        p[x] = color
+
+def _waiting_cs(cs, wait):
+    """Wrap a chip select so the bus is idle before it is released."""
+    def select(v):
+        if v:
+            wait()
+        cs(v)
+    return select
 
 class ST7789(object):
     """Sitronix ST7789 display driver
 
+    The driver supports the controller's hardware vertical scrolling. Once
+    the contents of the scroll area have been scrolled,
+    :py:meth:`~.set_window` continues to address the frame memory directly
+    but :py:meth:`~.rawblit` and :py:meth:`~.fill` use display coordinates
+    (and :py:meth:`~.translate` can be used to convert between the two).
+
+    .. attribute:: scroll_offset
+
+        Number of rows the contents of the scroll area have been scrolled
+        up by (always less than :py:attr:`scroll_height`)
+
+    .. attribute:: scroll_top
+
+        First row of the scroll area (None until scrolling is used)
+
+    .. attribute:: scroll_height
+
+        Number of rows in the scroll area (None until scrolling is used)
+
+    .. attribute:: linebuffer
+
+        Scratch buffer, shared with the drawing library, that holds one or
+        more rows of RGB565 pixels. A taller buffer costs RAM but allows
+        the pixels to be sent in fewer, larger, SPI transfers.
+
+    .. attribute:: linebuffers
+
+        Pair of line buffers that drawing code should fill alternately, so
+        that one can be prepared while the other is still being sent. Both
+        are the same buffer unless the driver is double buffered.
+
     .. automethod:: __init__
     """
-    def __init__(self, width, height):
+    def __init__(self, width, height, lines=1):
         """Configure the size of the display.
 
         :param int width: Display width, in pixels
         :param int height: Display height in pixels
+        :param int lines: Height, in rows, of the line buffer
         """
         self.width = width
         self.height = height
-        self.linebuffer = memoryview(bytearray(2 * width))
+        self.linebuffer = memoryview(bytearray(2 * width * lines))
+        self.linebuffers = (self.linebuffer, self.linebuffer)
         self.window = bytearray(4)
         self.init_display()
 
@@ -52,6 +111,14 @@ class ST7789(object):
         """Reset and initialize the display."""
         self.reset()
 
+        # The reset restores the default window and scroll area so we must
+        # forget the values we last sent to the display
+        self._cols = None
+        self._rows = None
+        self.scroll_offset = 0
+        self.scroll_top = None
+        self.scroll_height = None
+
         self.write_cmd(_SLPOUT)
         sleep_ms(10)
 
@@ -106,12 +173,124 @@ class ST7789(object):
         else:
             self.write_cmd(_DISPON)
 
+    def partial(self, y=None, height=None):
+        """Restrict the display to a band of rows.
+
+        Partial mode reduces the power consumed by the panel when only a
+        small part of the display needs to be visible. The rows outside the
+        band are blanked but the frame memory is preserved so the whole
+        display reappears when partial mode is disabled.
+
+        :param y:      Y coordinate of the top-most row of the band, or None
+                       to return to normal mode
+        :param height: Number of rows in the band
+        """
+        if y is None:
+            self.write_cmd(_NORON)
+            return
+
+        end = y + height - 1
+        self.write_cmd(_PTLAR)
+        self.write_data(bytes((y >> 8, y & 0xff, end >> 8, end & 0xff)))
+        self.write_cmd(_PTLON)
+
+    def idle(self, idle):
+        """Enter or leave idle mode.
+
+        In idle mode the panel shows only eight colours (the most
+        significant bit of each of the red, green and blue channels),
+        reducing the power it consumes.
+
+        :param bool idle: True to enter idle mode, False for normal mode.
+        """
+        if idle:
+            self.write_cmd(_IDMON)
+        else:
+            self.write_cmd(_IDMOFF)
+
+    def set_scroll_area(self, top=0, height=None):
+        """Define the region of the display that can be scrolled.
+
+        Rows above and below the scroll area are fixed in place. Changing
+        the scroll area resets the scroll offset so the contents of the
+        display should be redrawn afterwards.
+
+        :param top:    First row of the scroll area
+        :param height: Number of rows in the scroll area, defaults to None
+                       (which means extend to the bottom of the display)
+        """
+        if height is None:
+            height = self.height - top
+        bottom = _FRAME_ROWS - top - height
+
+        self.write_cmd(_VSCRDEF)
+        self.write_data(bytes((top >> 8, top & 0xff,
+                               height >> 8, height & 0xff,
+                               bottom >> 8, bottom & 0xff)))
+        self.scroll_top = top
+        self.scroll_height = height
+        self.scroll_offset = 0
+        self._scroll_start()
+
+    def scroll(self, dy):
+        """Scroll the contents of the scroll area.
+
+        Scrolling moves the image without redrawing it. Rows that scroll
+        off one edge of the scroll area reappear at the other edge.
+
+        :param dy: Number of rows to scroll up by (negative values scroll
+                   down)
+        """
+        if self.scroll_top is None:
+            self.set_scroll_area()
+        self.scroll_offset = (self.scroll_offset + dy) % self.scroll_height
+        self._scroll_start()
+
+    def _scroll_start(self):
+        vsp = self.scroll_top + self.scroll_offset
+        self.write_cmd(_VSCSAD)
+        self.write_data(bytes((vsp >> 8, vsp & 0xff)))
+
+    def translate(self, y, height):
+        """Find the frame memory rows that are shown in a range of rows.
+
+        :param y:      Y coordinate of the top-most row, in display
+                       coordinates
+        :param height: Number of rows
+        :returns:      List of (y, height) tuples describing each
+                       contiguous block of frame memory, from top to bottom
+        """
+        offset = self.scroll_offset
+        if not offset:
+            return [(y, height)]
+
+        top = self.scroll_top
+        bottom = top + self.scroll_height
+        end = y + height
+        pieces = []
+        while y < end:
+            if top <= y < bottom:
+                fy = top + (y - top + offset) % self.scroll_height
+                n = min(end, bottom) - y
+                if n > bottom - fy:
+                    n = bottom - fy
+            else:
+                fy = y
+                n = (min(end, top) if y < top else end) - y
+            pieces.append((fy, n))
+            y += n
+        return pieces
+
     @micropython.native
     def set_window(self, x, y, width, height):
         """Set the clipping rectangle.
 
         All writes to the display will be wrapped at the edges of the rectangle.
 
+        The driver remembers the current window and only sends the column
+        and row addresses that have changed. The write pointer is always
+        reset to the top-left of the rectangle.
+
         :param x:  X coordinate of the left-most pixels of the rectangle
         :param y:  Y coordinate of the top-most pixels of the rectangle
         :param w:  Width of the rectangle, defaults to None (which means select
@@ -126,19 +305,25 @@ class ST7789(object):
         xp = x + width - 1
         yp = y + height - 1
 
-        write_cmd(_CASET)
-        window[0] = x >> 8
-        window[1] = x & 0xff
-        window[2] = xp >> 8
-        window[3] = xp & 0xff
-        write_data(window)
-
-        write_cmd(_RASET)
-        window[0] = y >> 8
-        window[1] = y & 0xff
-        window[2] = yp >> 8
-        window[3] = yp & 0xff
-        write_data(window)
+        cols = (x << 16) + xp
+        if cols != self._cols:
+            write_cmd(_CASET)
+            window[0] = x >> 8
+            window[1] = x & 0xff
+            window[2] = xp >> 8
+            window[3] = xp & 0xff
+            write_data(window)
+            self._cols = cols
+
+        rows = (y << 16) + yp
+        if rows != self._rows:
+            write_cmd(_RASET)
+            window[0] = y >> 8
+            window[1] = y & 0xff
+            window[2] = yp >> 8
+            window[3] = yp & 0xff
+            write_data(window)
+            self._rows = rows
 
         write_cmd(_RAMWR)
 
@@ -153,9 +338,20 @@ class ST7789(object):
         :param h:  Height of the rectangle, defaults to None (which means select
                    the bottom-most pixel of the display)
         """
-        self.set_window(x, y, width, height)
-        self.write_data(buf)
+        if not self.scroll_offset:
+            self.set_window(x, y, width, height)
+            self.write_data(buf)
+            return
 
+        buf = memoryview(buf)
+        offset = 0
+        for (fy, rows) in self.translate(y, height):
+            self.set_window(x, fy, width, rows)
+            sz = 2 * width * rows
+            self.write_data(buf[offset:offset+sz])
+            offset += sz
+
+    @micropython.native
     def fill(self, bg, x=0, y=0, w=None, h=None):
         """Draw a solid colour rectangle.
 
@@ -174,17 +370,24 @@ class ST7789(object):
             w = self.width - x
         if not h:
             h = self.height - y
-        self.set_window(x, y, w, h)
 
         # Populate the line buffer
-        buf = self.linebuffer[0:2*w]
-        for xi in range(0, 2*w, 2):
-            buf[xi] = bg >> 8
-            buf[xi+1] = bg & 0xff
-
-        # Do the fill
-        for yi in range(h):
-            self.write_data(buf)
+        buf = self.linebuffer
+        sz = len(buf) // 2
+        _fill(buf, bg, min(sz, w * h))
+
+        # Stream each block of frame memory in a single write sequence
+        quick_write = self.quick_write
+        for (fy, rows) in self.translate(y, h):
+            self.set_window(x, fy, w, rows)
+            remaining = w * rows
+            self.quick_start()
+            while remaining >= sz:
+                quick_write(buf)
+                remaining -= sz
+            if remaining:
+                quick_write(buf[0:2*remaining])
+            self.quick_end()
 
 class ST7789_SPI(ST7789):
     """
@@ -192,10 +395,15 @@ class ST7789_SPI(ST7789):
 
         Send data to the display as part of an optimized write sequence.
 
+        If the driver is double buffered then the write is asynchronous and
+        buf must not be modified until the next call to quick_write() or
+        :py:meth:`~.quick_end` (which wait for the transfer to complete).
+
         :param bytes-like buf: Data, must be in a form that can be directly
                                consumed by the SPI bus.
     """
-    def __init__(self, width, height, spi, cs, dc, res=None, rate=8000000):
+    def __init__(self, width, height, spi, cs, dc, res=None, rate=8000000,
+                 lines=1, double_buffer=False):
         """Configure the display.
 
         :param int width: Width of the display
@@ -207,9 +415,22 @@ class ST7789_SPI(ST7789):
         :param machine.Pin res: Pin (or signal) to, optionally, use to reset
                                 the display.
         :param int rate: SPI bus frequency
+        :param int lines: Height, in rows, of the line buffer
+        :param bool double_buffer: Allocate a second line buffer and send
+                                   data without waiting for the bus. This
+                                   is ignored if the SPI controller cannot
+                                   write asynchronously.
         """
-        self.quick_write = spi.write
+        if double_buffer and 'write_async' in dir(spi):
+            self._spi_write = spi.write_async
+            self.wait = spi.wait
+        else:
+            self._spi_write = spi.write
+            double_buffer = False
+        self.quick_write = self._spi_write
         self.cs = cs.value
+        if double_buffer:
+            self.cs = _waiting_cs(cs.value, self.wait)
         self.dc = dc.value
         self.res = res
         self.rate = rate
@@ -221,7 +442,10 @@ class ST7789_SPI(ST7789):
         if res:
             res.init(res.OUT, value=0)
 
-        super().__init__(width, height)
+        super().__init__(width, height, lines)
+        if double_buffer:
+            self.linebuffers = (self.linebuffer,
+                                memoryview(bytearray(len(self.linebuffer))))
 
     def reset(self):
         """Reset the display.
@@ -267,6 +491,54 @@ class ST7789_SPI(ST7789):
         self.quick_write(buf)
         cs(1)
 
+    def wait(self):
+        """Wait for an asynchronous write to complete.
+
+        This does nothing unless the driver is double buffered.
+        """
+        pass
+
+    def instrument(self, stats):
+        """Count the traffic sent to the display.
+
+        Instrumentation is opt-in and has no cost when disabled. When
+        enabled the windows, commands and bytes sent to the display are
+        accumulated into the ``windows``, ``cmds`` and ``bytes`` attributes
+        of stats.
+
+        :param stats: Counters to update (typically a
+                      :py:class:`draw565.Stats`) or None to disable the
+                      instrumentation.
+        """
+        for name in ('write_cmd', 'set_window'):
+            try:
+                delattr(self, name)
+            except AttributeError:
+                pass
+        self.quick_write = self._spi_write
+        if not stats:
+            return
+
+        spi_write = self._spi_write
+        write_cmd = self.write_cmd
+        set_window = self.set_window
+
+        def counted_write(buf):
+            stats.bytes += len(buf)
+            spi_write(buf)
+
+        def counted_cmd(cmd):
+            stats.cmds += 1
+            write_cmd(cmd)
+
+        def counted_window(x, y, width, height):
+            stats.windows += 1
+            set_window(x, y, width, height)
+
+        self.quick_write = counted_write
+        self.write_cmd = counted_cmd
+        self.set_window = counted_window
+
     def quick_start(self):
         """Prepare for an optimized write sequence.
 
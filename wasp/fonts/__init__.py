@@ -9,11 +9,55 @@ import fonts.sans36 as sans36
 def height(font):
     return font.height()
 
+def bpp(font):
+    """Get the number of bits used for each pixel of a font's glyphs.
+
+    Anti-aliased fonts, generated by ``tools/aafont.py``, have 2 or 4 bits
+    of coverage per pixel and provide a bpp() function. All other fonts
+    are 1-bit.
+    """
+    if hasattr(font, 'bpp'):
+        return font.bpp()
+    return 1
+
+_tables = {}
+
+def widths(font):
+    """Get the advance width table for a font.
+
+    The table holds the width of the default glyph followed by the widths
+    of chr(32) to chr(126) inclusive. Fonts processed by
+    ``tools/fontwidths.py`` include a precomputed table, for any other font
+    the table is generated the first time it is needed.
+
+    Characters beyond chr(126) are not in the table, use :py:func:`advance`
+    to measure those.
+    """
+    if hasattr(font, 'widths'):
+        return font.widths()
+
+    key = id(font)
+    if key not in _tables:
+        _tables[key] = bytes([font.get_ch(chr(ch))[2] for ch in range(31, 127)])
+    return _tables[key]
+
+def advance(font, table, ch):
+    """Get the width of a character using the advance width table.
+
+    Characters beyond the end of the table may still be included in the
+    font so these are measured using the glyph itself.
+    """
+    oc = ord(ch)
+    if oc > 126:
+        return font.get_ch(ch)[2]
+    return table[oc - 31 if oc >= 32 else 0]
+
 def width(font, s):
-    w = 0
+    table = widths(font)
+    w = len(s)
     for ch in s:
-        (_, _, wc) = font.get_ch(ch)
-        w += wc + 1
+        oc = ord(ch)
+        w += table[oc - 31] if 32 <= oc <= 126 else advance(font, table, ch)
 
     return w
 
@@ -262,3 +262,15 @@ def get_ch(ch):
     next_offs = doff + 2 + ((width - 1)//8 + 1) * 18
     return _mvfont[doff + 2:next_offs], 18, width
  
+
+# Advance widths, generated by tools/fontwidths.py
+_widths =\
+b'\x0a\x06\x07\x08\x0f\x0b\x11\x0d\x04\x07\x07\x09\x0f\x06\x07\x06'\
+b'\x06\x0b\x0b\x0b\x0b\x0b\x0b\x0b\x0b\x0b\x0b\x06\x06\x0f\x0f\x0f'\
+b'\x0a\x12\x0c\x0c\x0d\x0e\x0b\x0a\x0e\x0e\x06\x07\x0d\x0a\x10\x0e'\
+b'\x0e\x0b\x0e\x0d\x0b\x0c\x0e\x0c\x13\x0d\x0c\x0d\x07\x06\x07\x0f'\
+b'\x09\x09\x0a\x0b\x09\x0b\x0b\x07\x0b\x0b\x05\x05\x0b\x05\x11\x0b'\
+b'\x0b\x0b\x0b\x08\x08\x07\x0b\x0b\x10\x0b\x0b\x09\x0b\x06\x0b\x0f'
+
+def widths():
+    return _widths
@@ -367,3 +367,15 @@ def get_ch(ch):
 
     next_offs = doff + 2 + ((width - 1)//8 + 1) * 24
     return _mvfont[doff + 2:next_offs], 24, width
+
+# Advance widths, generated by tools/fontwidths.py
+_widths =\
+b'\x0c\x07\x09\x0b\x13\x0f\x16\x12\x06\x09\x09\x0c\x13\x07\x08\x07'\
+b'\x08\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x08\x08\x13\x13\x13'\
+b'\x0c\x17\x10\x10\x10\x12\x0f\x0d\x12\x11\x07\x08\x0f\x0d\x14\x11'\
+b'\x12\x0e\x12\x10\x0f\x0e\x11\x10\x17\x10\x0e\x10\x09\x08\x09\x13'\
+b'\x0c\x0c\x0e\x0f\x0d\x0f\x0e\x09\x0f\x0f\x06\x07\x0d\x06\x16\x0f'\
+b'\x0e\x0e\x0e\x09\x0c\x09\x0f\x0e\x13\x0e\x0e\x0c\x0f\x08\x0f\x13'
+
+def widths():
+    return _widths
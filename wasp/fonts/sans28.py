@@ -117,3 +117,15 @@ def get_ch(ch):
     next_offs = doff + 2 + ((width - 1)//8 + 1) * 27
     return _mvfont[doff + 2:next_offs], 27, width
  
+
+# Advance widths, generated by tools/fontwidths.py
+_widths =\
+b'\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x1f\x0c\x0d\x0c'\
+b'\x0c\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x0c\x0c\x0c\x0c\x0c'\
+b'\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c'\
+b'\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c'\
+b'\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c'\
+b'\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c'
+
+def widths():
+    return _widths
@@ -166,3 +166,15 @@ def get_ch(ch):
     next_offs = doff + 2 + ((width - 1)//8 + 1) * 36
     return _mvfont[doff + 2:next_offs], 36, width
  
+
+# Advance widths, generated by tools/fontwidths.py
+_widths =\
+b'\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x27\x10\x11\x10'\
+b'\x10\x1e\x1e\x1e\x1e\x1e\x1e\x1e\x1e\x1e\x1e\x10\x10\x10\x10\x10'\
+b'\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'\
+b'\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'\
+b'\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'\
+b'\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'
+
+def widths():
+    return _widths
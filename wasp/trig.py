@@ -0,0 +1,81 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2020 Daniel Thompson
+
+"""Fixed-point trigonometry
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Integer sine and cosine functions, based on a lookup table, for use by
+watch faces and drawing code that cannot afford to allocate a float every
+time it needs to calculate an angle.
+
+Angles are measured in whole degrees and results are scaled by
+:py:data:`ONE` (so ``isin(90) == ONE``). Clock hands that move in
+1/60 turn steps can use ``6 * step`` as the angle.
+
+The polar functions adopt the same navigational conventions as
+:py:meth:`draw565.Draw565.polar`: zero is vertically upwards and angles
+increase clockwise.
+
+.. data:: ONE
+
+    The fixed point representation of 1.0 (16384).
+"""
+
+from micropython import const
+
+ONE = const(16384)
+_HALF = const(8192)
+
+# round(ONE * sin(theta)) for 0 <= theta <= 90
+_SIN = (
+        0, 286, 572, 857, 1143, 1428, 1713, 1997, 2280, 2563,
+        2845, 3126, 3406, 3686, 3964, 4240, 4516, 4790, 5063, 5334,
+        5604, 5872, 6138, 6402, 6664, 6924, 7182, 7438, 7692, 7943,
+        8192, 8438, 8682, 8923, 9162, 9397, 9630, 9860, 10087, 10311,
+        10531, 10749, 10963, 11174, 11381, 11585, 11786, 11982, 12176, 12365,
+        12551, 12733, 12911, 13085, 13255, 13421, 13583, 13741, 13894, 14044,
+        14189, 14330, 14466, 14598, 14726, 14849, 14968, 15082, 15191, 15296,
+        15396, 15491, 15582, 15668, 15749, 15826, 15897, 15964, 16026, 16083,
+        16135, 16182, 16225, 16262, 16294, 16322, 16344, 16362, 16374, 16382,
+        16384,
+)
+
+def isin(theta):
+    """Sine of an angle.
+
+    :param theta: Angle, in degrees
+    :returns:     Sine of theta, multiplied by ONE
+    """
+    theta %= 360
+    if theta < 180:
+        return _SIN[theta if theta <= 90 else 180 - theta]
+    theta -= 180
+    return -_SIN[theta if theta <= 90 else 180 - theta]
+
+def icos(theta):
+    """Cosine of an angle.
+
+    :param theta: Angle, in degrees
+    :returns:     Cosine of theta, multiplied by ONE
+    """
+    return isin(theta + 90)
+
+def polar_x(x, theta, r):
+    """X coordinate of a point given in polar coordinates.
+
+    :param x:     X coordinate of the origin
+    :param theta: Angle, in degrees, clockwise from vertically upwards
+    :param r:     Distance from the origin
+    :returns:     X coordinate, rounded to the nearest pixel
+    """
+    return x + ((r * isin(theta) + _HALF) >> 14)
+
+def polar_y(y, theta, r):
+    """Y coordinate of a point given in polar coordinates.
+
+    :param y:     Y coordinate of the origin
+    :param theta: Angle, in degrees, clockwise from vertically upwards
+    :param r:     Distance from the origin
+    :returns:     Y coordinate, rounded to the nearest pixel
+    """
+    return y - ((r * icos(theta) + _HALF) >> 14)
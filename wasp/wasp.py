@@ -52,6 +52,50 @@ class EventMask():
     BUTTON = 0x0008
     NEXT = 0x0010
 
+class Theme():
+    """Enumerated theme colours.
+
+    These can be passed to :py:meth:`Manager.theme` and
+    :py:meth:`Manager.shade` in place of the name of the colour, which
+    avoids searching for the name every time the colour is needed.
+    """
+    BLE = 0
+    SCROLL_INDICATOR = 1
+    BATTERY = 2
+    STATUS_CLOCK = 3
+    NOTIFY_ICON = 4
+    BRIGHT = 5
+    MID = 6
+    UI = 7
+    SPOT1 = 8
+    SPOT2 = 9
+    CONTRAST = 10
+
+_THEME_PARTS = ("ble",
+                "scroll-indicator",
+                "battery",
+                "status-clock",
+                "notify-icon",
+                "bright",
+                "mid",
+                "ui",
+                "spot1",
+                "spot2",
+                "contrast")
+
+def _theme_index(theme_part):
+    """Convert the name of a theme colour into a :py:class:`.Theme` index.
+
+    :raises IndexError: If there is no such theme colour
+    """
+    if isinstance(theme_part, str):
+        if theme_part not in _THEME_PARTS:
+            raise IndexError('Theme part {} does not exist'.format(theme_part))
+        return _THEME_PARTS.index(theme_part)
+    if not 0 <= theme_part < len(_THEME_PARTS):
+        raise IndexError('Theme part {} does not exist'.format(theme_part))
+    return theme_part
+
 class PinHandler():
     """Pin (and Signal) event generator.
 
@@ -129,8 +173,10 @@ class Manager():
                 b'\xdd\xd0'     # spot2
                 b'\x00\x0f'     # contrast
         )
+        self._update_shades()
 
         self.blank_after = 15
+        self.always_on = False
 
         self._alarms = []
         self._brightness = 2
@@ -144,6 +190,8 @@ class Manager():
         self._charging = True
         self._scheduled = False
         self._scheduling = False
+        self._ambient = None
+        self._ambient_at = 0
 
     def secondary_init(self):
         global free
@@ -387,12 +435,22 @@ class Manager():
 
     def sleep(self):
         """Enter the deepest sleep state possible.
+
+        If ``always_on`` is set, and the application supports it,
+        then the display enters a low power ambient mode instead of being
+        switched off. Applications opt into ambient mode by providing an
+        ``ambient()`` method. This is called when the watch goes to sleep
+        and then once a minute until it wakes up. It must update the
+        display and return the band of rows, as a (y, height) tuple, that
+        should remain visible (or None to switch the display off). Only
+        that band is shown and the panel is limited to eight colours.
         """
         watch.backlight.set(0)
         if 'sleep' not in dir(self.app) or not self.app.sleep():
             self.switch(self.quick_ring[0])
             self.app.sleep()
-        watch.display.poweroff()
+        if not self._enter_ambient():
+            watch.display.poweroff()
         watch.touch.sleep()
         self._charging = watch.battery.charging()
         self.sleep_at = None
@@ -401,7 +459,10 @@ class Manager():
         """Return to a running state.
         """
         if not self.sleep_at:
-            watch.display.poweron()
+            if self._ambient:
+                self._leave_ambient()
+            else:
+                watch.display.poweron()
             if 'wake' in dir(self.app):
                 self.app.wake()
             watch.backlight.set(self._brightness)
@@ -409,6 +470,44 @@ class Manager():
 
         self.keep_awake()
 
+    def _enter_ambient(self):
+        """Switch the display into ambient mode (if the app supports it).
+
+        :returns: True if the display is now in ambient mode
+        """
+        if not self.always_on or 'ambient' not in dir(self.app):
+            return False
+        area = self.app.ambient()
+        if not area:
+            return False
+
+        display = watch.display
+        display.partial(*area)
+        display.idle(True)
+        watch.backlight.set(1)
+        self._ambient = area
+        self._ambient_at = (watch.rtc.time() // 60 + 1) * 60
+        return True
+
+    def _update_ambient(self):
+        """Allow the app to update the ambient display (once a minute)."""
+        self._ambient_at = (watch.rtc.time() // 60 + 1) * 60
+        area = self.app.ambient()
+        if not area:
+            self._leave_ambient()
+            watch.backlight.set(0)
+            watch.display.poweroff()
+        elif area != self._ambient:
+            watch.display.partial(*area)
+            self._ambient = area
+
+    def _leave_ambient(self):
+        """Restore the display to normal mode."""
+        display = watch.display
+        display.idle(False)
+        display.partial(None)
+        self._ambient = None
+
     def _handle_button(self, state):
         """Process a button-press (or unpress) event.
         """
@@ -498,6 +597,9 @@ class Manager():
 
             gc.collect()
         else:
+            if self._ambient and update and rtc.time() >= self._ambient_at:
+                self._update_ambient()
+
             if 1 == self._button.get_event() or \
                     self._charging != watch.battery.charging():
                 self.wake()
@@ -534,6 +636,7 @@ class Manager():
             except KeyboardInterrupt:
                 raise
             except MemoryError:
+                watch.drawable.drop_caches()
                 self.switch(PagerApp("Your watch is low on memory.\n\nYou may want to reboot."))
             except Exception as e:
                 # Only print the exception if the watch provides a way to do so!
@@ -552,6 +655,7 @@ class Manager():
         try:
             self._tick()
         except MemoryError:
+            watch.drawable.drop_caches()
             self.switch(PagerApp("Your watch is low on memory.\n\nYou may want to reboot."))
         except Exception as e:
             # Only print the exception if the watch provides a way to do so!
@@ -584,24 +688,54 @@ class Manager():
         if len(self._theme) != len(new_theme):
             return False
         self._theme = new_theme
+        self._update_shades()
         return True
 
-    def theme(self, theme_part: str) -> int:
-        """Returns the relevant part of theme. For more see ../tools/themer.py"""
-        theme_parts = ("ble",
-                       "scroll-indicator",
-                       "battery",
-                       "status-clock",
-                       "notify-icon",
-                       "bright",
-                       "mid",
-                       "ui",
-                       "spot1",
-                       "spot2",
-                       "contrast")
-        if theme_part not in theme_parts:
-            raise IndexError('Theme part {} does not exist'.format(theme_part))
-        idx = theme_parts.index(theme_part) * 2
+    def theme(self, theme_part) -> int:
+        """Returns the relevant part of theme. For more see ../tools/themer.py
+
+        :param theme_part: Name of the theme colour, or the equivalent
+                           :py:class:`.Theme` index
+        """
+        idx = _theme_index(theme_part) * 2
         return (self._theme[idx] << 8) | self._theme[idx+1]
 
+    def shade(self, theme_part, step) -> int:
+        """Returns a lighter or darker shade of a theme colour.
+
+        The result is the same as calling
+        :py:meth:`draw565.Draw565.lighten` (for positive steps) or
+        :py:meth:`draw565.Draw565.darken` (for negative steps) but the
+        shades are calculated when the theme is set so, for steps no larger
+        than the theme's contrast, this is just a table lookup.
+
+        .. code-block:: python
+
+            fg = wasp.system.shade(wasp.Theme.UI, wasp.system.theme(wasp.Theme.CONTRAST))
+
+        :param theme_part: Name of the theme colour, or the equivalent
+                           :py:class:`.Theme` index
+        :param step:       Number of steps to lighten (or, if negative,
+                           darken) the colour by
+        """
+        theme_part = _theme_index(theme_part)
+        steps = self._steps
+        if -steps <= step <= steps:
+            return self._shades[theme_part][steps + step]
+
+        draw = watch.drawable
+        color = self.theme(theme_part)
+        if step > 0:
+            return draw.lighten(color, step)
+        return draw.darken(color, -step)
+
+    def _update_shades(self):
+        """Calculate the shades of every theme colour."""
+        theme = self._theme
+        draw = watch.drawable
+        steps = min(max(self.theme(Theme.CONTRAST), 1), 31)
+        self._steps = steps
+        self._shades = [draw.shades((theme[i] << 8) | theme[i+1], steps)
+                        for i in range(0, len(theme), 2)]
+
 system = Manager()
@@ -8,6 +8,7 @@ The widget library allows common fragments of logic and drawing code to be
 shared between applications.
 """
 
+import draw565
 import fonts
 import icons
 import wasp
@@ -111,7 +112,10 @@ class Clock:
             draw = wasp.watch.drawable
             draw.set_font(fonts.sans28)
             draw.set_color(wasp.system.theme("status-clock"))
-            draw.string(t1, 52, 4, 138)
+            if on_screen:
+                draw.update_string(t1, 52, 4, 138)
+            else:
+                draw.string(t1, 52, 4, 138)
 
         self.on_screen = now
         return now
@@ -225,31 +229,58 @@ class ScrollIndicator:
 
 
 class Button:
-    """A button with a text label."""
+    """A button with a text label.
+
+    If canvas is True then the button is composed off-screen, using a
+    :py:class:`draw565.Canvas`, and sent to the display in a single window.
+    This avoids flicker but the canvas needs 2 bytes of RAM for every
+    pixel of the button, for as long as the button exists.
+    """
 
-    def __init__(self, x, y, w, h, label):
+    def __init__(self, x, y, w, h, label, canvas=False):
         self._im = (x, y, w, h, label)
+        self._canvas = canvas
 
     def draw(self):
         """Draw the button."""
-        bg = wasp.watch.drawable.darken(wasp.system.theme("ui"))
+        bg = wasp.system.shade(wasp.Theme.UI, -1)
         frame = wasp.system.theme("mid")
         txt = wasp.system.theme("bright")
         self.update(bg, frame, txt)
 
     def update(self, bg, frame, txt):
         draw = wasp.watch.drawable
+        (x, y, w, h, label) = self._im
+
+        canvas = self._canvas
+        if canvas:
+            if canvas is True:
+                canvas = draw565.Canvas(wasp.watch.display, w, h)
+                self._canvas = canvas
+            canvas.glyph_cache = draw.glyph_cache
+            self._compose(canvas, 0, 0, bg, frame, txt)
+            canvas.flush(x, y, draw)
+        else:
+            draw.begin()
+            try:
+                self._compose(draw, x, y, bg, frame, txt)
+            finally:
+                draw.commit()
+
+    def _compose(self, draw, x, y, bg, frame, txt):
         im = self._im
+        w = im[2]
+        h = im[3]
 
-        draw.fill(bg, im[0], im[1], im[2], im[3])
+        draw.fill(bg, x, y, w, h)
         draw.set_color(txt, bg)
         draw.set_font(fonts.sans24)
-        draw.string(im[4], im[0], im[1] + (im[3] // 2) - 12, width=im[2])
+        draw.string(im[4], x, y + (h // 2) - 12, width=w)
 
-        draw.fill(frame, im[0], im[1], im[2], 2)
-        draw.fill(frame, im[0], im[1] + im[3] - 2, im[2], 2)
-        draw.fill(frame, im[0], im[1], 2, im[3])
-        draw.fill(frame, im[0] + im[2] - 2, im[1], 2, im[3])
+        draw.fill(frame, x, y, w, 2)
+        draw.fill(frame, x, y + h - 2, w, 2)
+        draw.fill(frame, x, y, 2, h)
+        draw.fill(frame, x + w - 2, y, 2, h)
 
     def touch(self, event):
         """Handle touch events."""
@@ -272,18 +303,16 @@ class Button:
 class ToggleButton(Button):
     """A button with a text label that can be toggled on and off."""
 
-    def __init__(self, x, y, w, h, label):
-        super().__init__(x, y, w, h, label)
+    def __init__(self, x, y, w, h, label, canvas=False):
+        super().__init__(x, y, w, h, label, canvas)
         self.state = False
 
     def draw(self):
         """Draw the button."""
-        draw = wasp.watch.drawable
-
         if self.state:
-            bg = draw.darken(wasp.system.theme("ui"))
+            bg = wasp.system.shade(wasp.Theme.UI, -1)
         else:
-            bg = draw.darken(wasp.system.theme("mid"))
+            bg = wasp.system.shade(wasp.Theme.MID, -1)
         frame = wasp.system.theme("mid")
         txt = wasp.system.theme("bright")
 
@@ -326,7 +355,8 @@ class Checkbox:
         im = self._im
         if self.state:
             c1 = wasp.system.theme("ui")
-            c2 = draw.lighten(c1, wasp.system.theme("contrast"))
+            c2 = wasp.system.shade(wasp.Theme.UI,
+                                   wasp.system.theme(wasp.Theme.CONTRAST))
             fg = c2
         else:
             c1 = 0
@@ -414,52 +444,56 @@ class Slider:
         light = self._lowlight
 
         knob_x = x + ((_SLIDER_TRACK * self.value) // (self._steps - 1))
-        draw.blit(icons.knob, knob_x, y, color)
-
-        w = knob_x - x
-        if w > 0:
-            draw.fill(0, x, y, w, _SLIDER_TRACK_Y1)
-            if w > _SLIDER_KNOB_RADIUS:
-                draw.fill(
-                    0,
-                    x,
-                    y + _SLIDER_TRACK_Y1,
-                    _SLIDER_KNOB_RADIUS,
-                    _SLIDER_TRACK_HEIGHT,
-                )
-                draw.fill(
-                    color,
-                    x + _SLIDER_KNOB_RADIUS,
-                    y + _SLIDER_TRACK_Y1,
-                    w - _SLIDER_KNOB_RADIUS,
-                    _SLIDER_TRACK_HEIGHT,
-                )
-            else:
-                draw.fill(0, x, y + _SLIDER_TRACK_Y1, w, _SLIDER_TRACK_HEIGHT)
-            draw.fill(0, x, y + _SLIDER_TRACK_Y2, w, _SLIDER_TRACK_Y1)
-
-        sx = knob_x + _SLIDER_KNOB_DIAMETER
-        w = _SLIDER_WIDTH - _SLIDER_KNOB_DIAMETER - w
-        if w > 0:
-            draw.fill(0, sx, y, w, _SLIDER_TRACK_Y1)
-            if w > _SLIDER_KNOB_RADIUS:
-                draw.fill(
-                    0,
-                    sx + w - _SLIDER_KNOB_RADIUS,
-                    y + _SLIDER_TRACK_Y1,
-                    _SLIDER_KNOB_RADIUS,
-                    _SLIDER_TRACK_HEIGHT,
-                )
-                draw.fill(
-                    light,
-                    sx,
-                    y + _SLIDER_TRACK_Y1,
-                    w - _SLIDER_KNOB_RADIUS,
-                    _SLIDER_TRACK_HEIGHT,
-                )
-            else:
-                draw.fill(0, sx, y + _SLIDER_TRACK_Y1, w, _SLIDER_TRACK_HEIGHT)
-            draw.fill(0, sx, y + _SLIDER_TRACK_Y2, w, _SLIDER_TRACK_Y1)
+        draw.begin()
+        try:
+            draw.blit(icons.knob, knob_x, y, color)
+
+            w = knob_x - x
+            if w > 0:
+                draw.fill(0, x, y, w, _SLIDER_TRACK_Y1)
+                if w > _SLIDER_KNOB_RADIUS:
+                    draw.fill(
+                        0,
+                        x,
+                        y + _SLIDER_TRACK_Y1,
+                        _SLIDER_KNOB_RADIUS,
+                        _SLIDER_TRACK_HEIGHT,
+                    )
+                    draw.fill(
+                        color,
+                        x + _SLIDER_KNOB_RADIUS,
+                        y + _SLIDER_TRACK_Y1,
+                        w - _SLIDER_KNOB_RADIUS,
+                        _SLIDER_TRACK_HEIGHT,
+                    )
+                else:
+                    draw.fill(0, x, y + _SLIDER_TRACK_Y1, w, _SLIDER_TRACK_HEIGHT)
+                draw.fill(0, x, y + _SLIDER_TRACK_Y2, w, _SLIDER_TRACK_Y1)
+
+            sx = knob_x + _SLIDER_KNOB_DIAMETER
+            w = _SLIDER_WIDTH - _SLIDER_KNOB_DIAMETER - w
+            if w > 0:
+                draw.fill(0, sx, y, w, _SLIDER_TRACK_Y1)
+                if w > _SLIDER_KNOB_RADIUS:
+                    draw.fill(
+                        0,
+                        sx + w - _SLIDER_KNOB_RADIUS,
+                        y + _SLIDER_TRACK_Y1,
+                        _SLIDER_KNOB_RADIUS,
+                        _SLIDER_TRACK_HEIGHT,
+                    )
+                    draw.fill(
+                        light,
+                        sx,
+                        y + _SLIDER_TRACK_Y1,
+                        w - _SLIDER_KNOB_RADIUS,
+                        _SLIDER_TRACK_HEIGHT,
+                    )
+                else:
+                    draw.fill(0, sx, y + _SLIDER_TRACK_Y1, w, _SLIDER_TRACK_HEIGHT)
+                draw.fill(0, sx, y + _SLIDER_TRACK_Y2, w, _SLIDER_TRACK_Y1)
+        finally:
+            draw.commit()
 
     def update(self):
         self.draw()
@@ -492,7 +526,8 @@ class Spinner:
         """Draw the spinner."""
         draw = watch.drawable
         im = self._im
-        fg = draw.lighten(wasp.system.theme("ui"), wasp.system.theme("contrast"))
+        fg = wasp.system.shade(wasp.Theme.UI,
+                               wasp.system.theme(wasp.Theme.CONTRAST))
         draw.blit(icons.up_arrow, im[0] + 30 - 8, im[1] + 20, fg)
         draw.blit(icons.down_arrow, im[0] + 30 - 8, im[1] + 120 - 20 - 9, fg)
         self.update()
@@ -578,15 +613,18 @@ class Stopwatch:
 
             y = self._y
             draw = wasp.watch.drawable
+            if self._last_count < 0:
+                string = draw.string
+            else:
+                string = draw.update_string
             draw.set_font(fonts.sans36)
             draw.set_color(
-                draw.lighten(wasp.system.theme("ui"), wasp.system.theme("contrast"))
+                wasp.system.shade(wasp.Theme.UI,
+                                  wasp.system.theme(wasp.Theme.CONTRAST))
             )
-            w = fonts.width(fonts.sans36, t1)
-            draw.string(t1, 180 - w, y)
-            draw.fill(0, 0, y, 180 - w, 36)
+            string(t1, 0, y, width=180, right=True)
             draw.set_font(fonts.sans24)
-            draw.string(t2, 180, y + 18, width=46)
+            string(t2, 180, y + 18, width=46)
 
             self._last_count = self.count
 
@@ -64,7 +64,8 @@ class ChronoApp():
         """
         draw = wasp.watch.drawable
         hi = wasp.system.theme('bright')
-        c1 = draw.darken(wasp.system.theme('spot1'), wasp.system.theme('contrast'))
+        c1 = wasp.system.shade(wasp.Theme.SPOT1,
+                               -wasp.system.theme(wasp.Theme.CONTRAST))
 
         if redraw:
             now = wasp.watch.rtc.get_localtime()
@@ -89,7 +90,7 @@ class ChronoApp():
                 return
 
         # Undraw old time
-        hh = (30 * (self._hh % 12)) + (self._mm / 2)
+        hh = (30 * (self._hh % 12)) + (self._mm // 2)
         mm = 6 * self._mm
         draw.polar(120, 120, hh, 5, 75, 7, 0)
         draw.polar(120, 120, mm, 5, 106, 5, 0)
@@ -99,7 +100,7 @@ class ChronoApp():
         self._mm = now[4]
 
         # Draw the new time
-        hh = (30 * (self._hh % 12)) + (self._mm / 2)
+        hh = (30 * (self._hh % 12)) + (self._mm // 2)
         mm = 6 * self._mm
         draw.polar(120, 120, hh, 5, 75, 7, hi)
         draw.polar(120, 120, hh, 5, 60, 3, draw.darken(c1, 2))
@@ -57,6 +57,19 @@ class ClockApp():
         """Periodic callback to update the display."""
         self._draw()
 
+    def ambient(self):
+        """Update the always-on display.
+
+        Only the hours and minutes remain visible in ambient mode so, to
+        save power, we update the digits without touching the rest of the
+        display.
+
+        :returns: The band of rows that contains the digits.
+        """
+        now = wasp.watch.rtc.get_localtime()
+        self._draw_digits(now)
+        return (80, 60)
+
     def preview(self):
         """Provide a preview for the watch face selection."""
         wasp.system.bar.clock = False
@@ -102,12 +115,20 @@ class ClockApp():
                 return
 
         # Draw the changeable parts of the watch face
-        draw.blit(DIGITS[now[4]  % 10], 4*48, 80, fg=hi)
-        draw.blit(DIGITS[now[4] // 10], 3*48, 80, fg=lo)
-        draw.blit(DIGITS[now[3]  % 10], 1*48, 80, fg=hi)
-        draw.blit(DIGITS[now[3] // 10], 0*48, 80, fg=lo)
+        self._draw_digits(now)
         draw.set_color(hi)
         draw.string(self._day_string(now), 0, 180, width=240)
 
         # Record the minute that is currently being displayed
         self._min = now[4]
+
+    def _draw_digits(self, now):
+        """Draw the hours and minutes."""
+        draw = wasp.watch.drawable
+        hi =  wasp.system.theme('bright')
+        lo =  wasp.system.theme('mid')
+
+        draw.blit(DIGITS[now[4]  % 10], 4*48, 80, fg=hi)
+        draw.blit(DIGITS[now[4] // 10], 3*48, 80, fg=lo)
+        draw.blit(DIGITS[now[3]  % 10], 1*48, 80, fg=hi)
+        draw.blit(DIGITS[now[3] // 10], 0*48, 80, fg=lo)